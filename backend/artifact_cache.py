@@ -0,0 +1,208 @@
+"""
+Content-addressed on-disk cache of training pipeline stage outputs
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import joblib
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'artifacts')
+DEFAULT_MAX_BYTES = 2 * 1024**3
+# Bump when the entry format or keying changes so old entries are never read
+CACHE_FORMAT = 1
+ENTRY_SUFFIX = '.joblib'
+
+
+def _is_library(module_name):
+    top = sys.modules.get(module_name.split('.')[0])
+    return module_name == 'builtins' or getattr(top, '__version__', None) is not None
+
+
+def _feed(digest, value):
+    """Add a canonical encoding of value to the hash"""
+    if value is None:
+        digest.update(b'N')
+    elif isinstance(value, str):
+        digest.update(b'S' + value.encode('utf-8') + b'\x00')
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        digest.update(b'B' + bytes(value))
+    elif isinstance(value, (bool, int, float, np.generic)):
+        digest.update(f"P{value!r}\x00".encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"A{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, pd.DataFrame):
+        digest.update(b'D' + json.dumps([[str(c), str(t)] for c, t in value.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().data)
+    elif isinstance(value, dict):
+        digest.update(f"M{len(value)}".encode())
+        for k in sorted(value, key=str):
+            _feed(digest, str(k))
+            _feed(digest, value[k])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"L{len(value)}".encode())
+        for item in value:
+            _feed(digest, item)
+    elif inspect.ismodule(value) and getattr(value, '__version__', None):
+        # Installed libraries are identified by version, project modules by source
+        digest.update(f"V{value.__name__}={value.__version__}\x00".encode())
+    elif inspect.isclass(value) and _is_library(value.__module__):
+        # Types from builtins or installed libraries (str, np.int16) have no source to read
+        digest.update(f"T{value.__module__}.{value.__qualname__}\x00".encode())
+    elif inspect.ismodule(value) or inspect.isclass(value) or inspect.isroutine(value):
+        digest.update(b'C' + inspect.getsource(value).encode('utf-8'))
+    else:
+        digest.update(f"R{value!r}\x00".encode())
+
+
+def fingerprint(*values):
+    """Hex digest of values: data (arrays, frames, scalars, containers), upstream keys or code"""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _feed(digest, value)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Hex digest of a file's contents"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Stage outputs stored under a hash of everything that produced them.
+
+    A key covers the stage name, its inputs (data or upstream stage keys),
+    parameters and code (the source of the functions involved, or a
+    library's version), so a stage reruns exactly when one of those changes.
+    Entries are joblib files in root; the directory is kept under max_bytes
+    by deleting the least recently used entries (file mtime is refreshed on
+    every hit). A disabled cache computes everything and returns None keys.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage, inputs=(), params=None, code=()):
+        """Cache key for a stage run, or None when the cache is disabled"""
+        if not self.enabled:
+            return None
+        safe_stage = ''.join(ch if ch.isalnum() else '_' for ch in stage)
+        return f"{safe_stage}-{fingerprint(CACHE_FORMAT, stage, list(inputs), params, list(code))}"
+
+    def path(self, key):
+        return os.path.join(self.root, key + ENTRY_SUFFIX)
+
+    def load(self, key):
+        """(True, value) for a stored key, else (False, None)"""
+        if key is None:
+            return False, None
+        path = self.path(key)
+        try:
+            value = joblib.load(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False, None
+        except Exception as e:
+            print(f"⚠️  Discarding unreadable cache entry {path}: {e}")
+            os.remove(path)
+            self.misses += 1
+            return False, None
+        os.utime(path)
+        self.hits += 1
+        return True, value
+
+    def save(self, key, value):
+        """Store value under key, then evict old entries beyond max_bytes"""
+        if key is None:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits max_bytes; returns the count"""
+        if not os.path.isdir(self.root):
+            return 0
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(ENTRY_SUFFIX):
+                stat = os.stat(os.path.join(self.root, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and name == keep + ENTRY_SUFFIX:
+                continue
+            os.remove(os.path.join(self.root, name))
+            total -= size
+            removed += 1
+        return removed
+
+    def stage(self, stage, compute, inputs=(), params=None, code=()):
+        """Return (key, value), running compute() only when no entry exists for the key"""
+        key = self.key(stage, inputs, params, code)
+        hit, value = self.load(key)
+        if hit:
+            print(f"   ⏭️  {stage}: unchanged, loaded from cache ({key[-12:]})")
+            return key, value
+        value = compute()
+        self.save(key, value)
+        return key, value
+
+    def _output_record(self, path):
+        name = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(self.root, 'outputs', name + '.json')
+
+    def _output_current(self, path, key):
+        """True when path still holds the file written for key"""
+        record_path = self._output_record(path)
+        if not (os.path.exists(path) and os.path.exists(record_path)):
+            return False
+        with open(record_path) as f:
+            record = json.load(f)
+        stat = os.stat(path)
+        return record == {'key': key, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def output(self, paths, key, write):
+        """Call write() to produce the file(s) at paths unless they all hold the output for key.
+
+        paths is one path or every file write() produces. The cache
+        remembers the key, size and mtime of each file it saw written, so
+        when any of them was edited, replaced or deleted since, write() runs
+        again. Returns True when write() ran.
+        """
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        if key is not None and all(self._output_current(path, key) for path in paths):
+            label = paths[0] if len(paths) == 1 else ', '.join(os.path.basename(path) for path in paths)
+            print(f"   ⏭️  {label}: unchanged, not rewritten")
+            return False
+        mtimes_before = {path: os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in paths}
+        write()
+        if key is not None:
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                stat = os.stat(path)
+                if stat.st_mtime_ns != mtimes_before[path]:
+                    record_path = self._output_record(path)
+                    os.makedirs(os.path.dirname(record_path), exist_ok=True)
+                    with open(record_path, 'w') as f:
+                        json.dump({'key': key, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}, f)
+        return True
@@ -0,0 +1,172 @@
+"""
+Micro-batching request coalescer for the prediction endpoints
+"""
+import asyncio
+import bisect
+import inspect
+
+
+class Histogram:
+    """Bucketed histogram with fixed upper bounds, plus count and sum"""
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self):
+        labels = [f"<={b:g}" for b in self.buckets] + [f">{self.buckets[-1]:g}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0
+        }
+
+
+class PredictionBatcher:
+    """Coalesce concurrent single-customer predictions into vectorized calls.
+
+    Callers `await submit(item)`; a background task collects queued items
+    until `max_batch_size` is reached or `max_wait_ms` has passed since the
+    first item of the batch arrived, runs `predict_fn(items)` once and hands
+    each caller its own result. `predict_fn` takes a list and returns (or,
+    if it is a coroutine function, resolves to) a sequence of results in
+    the same order. Up to `max_in_flight` batches run concurrently, which
+    lets a worker pool score one batch while the next is being collected.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=2.0, max_in_flight=1):
+        self.predict_fn = predict_fn
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.queue_depth = Histogram([0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024])
+        self.batch_size = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256, 512])
+        self.n_requests = 0
+        self.n_batches = 0
+        self._queue = None
+        self._task = None
+        self._slots = None
+        self._in_flight = set()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the collector task on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop collecting and fail anything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+
+    async def submit(self, item):
+        """Queue one item and wait for its result"""
+        if not self.running:
+            raise RuntimeError("Prediction batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        self.queue_depth.observe(self._queue.qsize())
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        """Wait for the first item, then gather more until full or timed out"""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        try:
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Stopped mid-collection: these items already left the queue, so
+            # stop() can't see them; fail their callers here
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Prediction batcher stopped"))
+            raise
+        return batch
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            # Drop callers that gave up (e.g. client disconnected) before computing
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+
+            self.n_batches += 1
+            self.n_requests += len(batch)
+            self.batch_size.observe(len(batch))
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            results = self.predict_fn([item for item, _ in batch])
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": len(self._in_flight),
+            "requests": self.n_requests,
+            "batches": self.n_batches,
+            "queue_depth": self.queue_depth.snapshot(),
+            "batch_size": self.batch_size.snapshot()
+        }
@@ -0,0 +1,588 @@
+"""
+Command-line tools for the churn model
+
+    python backend/cli.py score customer_data.csv scores.parquet
+    python backend/cli.py generate customers.parquet --rows 10000000
+
+`score` streams a customer file (CSV or Parquet) through the served model
+bundle in fixed-size chunks and writes churn probability, risk level and
+retention actions per customer. Reading, scoring and writing run on
+separate threads connected by small bounded queues, so the stages overlap
+and memory stays at a few chunks however large the input is.
+
+`generate` writes seeded synthetic customers (see synthetic_data.py) for
+load and capacity tests, as one file or as shards written in parallel.
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feature_plan import CHANNEL_FEATURE
+from model_bundle import ModelBundle
+from tree_engine import default_backend
+from retention_rules import load_rules, HARYANA_RULES_PATH
+from risk_bands import risk_cutoffs_of, risk_levels
+from tabular_io import pa, pa_csv, pq, is_parquet, require_pyarrow, read_chunks, ChunkWriter
+import synthetic_data
+
+DEFAULT_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model.bundle")
+DEFAULT_CHUNK_SIZE = 100_000
+# Byte-range size of one CSV partition in parallel scoring (~100k rows of customer_data.csv)
+DEFAULT_PARTITION_MB = 16
+# Chunks buffered between stages; memory is bounded by ~(2 * depth + 2) chunks
+QUEUE_DEPTH = 2
+# How actions are written: "; "-joined action names, the full JSON list, or omitted
+ACTION_FORMATS = ('names', 'json', 'none')
+# CSV rows read to infer the passthrough columns' types for Parquet output
+PASSTHROUGH_SAMPLE_ROWS = 10_000
+
+# Same defaults as the optional CustomerData fields in main.py
+FEATURE_DEFAULTS = {
+    'customer_age': 35.0,
+    'account_age_days': 365.0,
+    'product_categories_browsed': 4.0,
+    'avg_session_duration_min': 10.0,
+    'discount_usage': 2,
+    'review_count': 1,
+    'payment_failures': 0,
+    'mobile_usage_pct': 50.0
+}
+
+
+class BulkScorer:
+    """Model bundle, feature layout and rule table for scoring whole DataFrames"""
+
+    def __init__(self, bundle_path=DEFAULT_BUNDLE_PATH, rules_path=None, backend=None, action_format='names'):
+        if action_format not in ACTION_FORMATS:
+            raise ValueError(f"Unknown action format '{action_format}', expected one of {ACTION_FORMATS}")
+        self.action_format = action_format
+        if not os.path.exists(bundle_path):
+            raise FileNotFoundError(f"{bundle_path} not found; run backend/train_and_save_model.py first")
+        self.bundle = ModelBundle(bundle_path)
+        self.model = self.bundle.forest(backend=backend or default_backend())
+        self.feature_names = self.bundle.feature_names
+        self.channel_classes = self.bundle.channel_classes
+        self.rules = load_rules(rules_path, default_path=HARYANA_RULES_PATH)
+        self.model_version = self.bundle.model_version
+        # Same bands the API serves: the bundle's optimized cutoffs or the defaults
+        self.risk_cutoffs = risk_cutoffs_of(self.bundle.metadata)
+
+        if self.bundle.scaler_folded:
+            self.coef = self.offset = None
+        else:
+            mean, scale = self.bundle.scaler_params()
+            self.coef = (1.0 / scale).astype(np.float64)
+            self.offset = (-mean / scale).astype(np.float64)
+
+    def input_columns(self):
+        """Columns read from the input: model features, channel and rule features"""
+        names = [name for name in self.feature_names if name != CHANNEL_FEATURE]
+        names.append('channel')
+        names += [name for name in self.rules.features if name not in names]
+        return names
+
+    def score_frame(self, df):
+        """Score a chunk of customers; returns churn_probability, risk_level, actions and error columns.
+
+        Missing optional features take the API defaults. Rows with a channel
+        unseen in training are not scored and carry an error instead.
+        """
+        if 'channel' not in df:
+            raise ValueError("Input is missing required column 'channel'")
+        n_rows = len(df)
+        valid = np.ones(n_rows, dtype=bool)
+        X = np.empty((n_rows, len(self.feature_names)), dtype=np.float64)
+        columns = {}
+        for j, name in enumerate(self.feature_names):
+            if name == CHANNEL_FEATURE:
+                # -1 marks channels unseen in training
+                codes = pd.Index(self.channel_classes).get_indexer(df['channel'])
+                X[:, j] = codes
+                valid = codes >= 0
+                continue
+            if name in df:
+                X[:, j] = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            elif name in FEATURE_DEFAULTS:
+                X[:, j] = FEATURE_DEFAULTS[name]
+            else:
+                raise ValueError(f"Input is missing required column '{name}'")
+            columns[name] = X[:, j]
+        if self.coef is not None:
+            X = X * self.coef + self.offset
+
+        churn_probs = np.full(n_rows, np.nan)
+        churn_probs[valid] = self.model.predict(X[valid])
+
+        # Rule features outside the model (and the channel names) come straight from the input
+        for name in self.rules.features:
+            if name not in columns and name in df:
+                columns[name] = df[name].to_numpy()
+        columns['channel'] = df['channel'].to_numpy()
+        action_lists, pattern = self.rules.recommend_patterns(columns, n_rows, churn_probability=churn_probs)
+        # Serialize each distinct action list once, then gather per row
+        encoded = np.array([self.encode_actions(actions) for actions in action_lists] or [''], dtype=object)
+        actions = encoded[pattern]
+
+        risk = risk_levels(churn_probs, self.risk_cutoffs)
+        error = np.full(n_rows, '', dtype=object)
+        if not valid.all():
+            invalid_channels = df['channel'].to_numpy()[~valid]
+            error[~valid] = [f"Unknown channel '{c}', expected one of {self.channel_classes}"
+                             for c in invalid_channels]
+            risk[~valid] = ''
+            actions[~valid] = ''
+        result = {'churn_probability': churn_probs, 'risk_level': risk}
+        if self.action_format != 'none':
+            result['actions'] = actions
+        result['error'] = error
+        return pd.DataFrame(result, index=df.index)
+
+    def output_schema(self, passthrough_fields=()):
+        """Arrow schema of the scored output, so every chunk, even an empty one, is written alike"""
+        fields = list(passthrough_fields) + [pa.field('churn_probability', pa.float64()),
+                                             pa.field('risk_level', pa.string())]
+        if self.action_format != 'none':
+            fields.append(pa.field('actions', pa.string()))
+        fields.append(pa.field('error', pa.string()))
+        return pa.schema(fields)
+
+    def encode_actions(self, actions):
+        if self.action_format == 'json':
+            return json.dumps(actions)
+        return "; ".join(action['action'] for action in actions)
+
+
+def _score_chunk(scorer, chunk, passthrough):
+    """Scores for one chunk, preceded by the passthrough columns it has"""
+    scored = scorer.score_frame(chunk)
+    kept = [name for name in passthrough if name in chunk]
+    if kept:
+        scored = pd.concat([chunk[kept], scored], axis=1)
+    return scored
+
+
+class _StageFailed(Exception):
+    pass
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once another stage has failed"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+    raise _StageFailed()
+
+
+def _get(q, stop):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    raise _StageFailed()
+
+
+def score_file(input_path, output_path, scorer, chunk_size=DEFAULT_CHUNK_SIZE,
+               passthrough=('customer_id',), progress_interval=5.0, log=print):
+    """Stream `input_path` through `scorer` into `output_path`.
+
+    Three threads run concurrently: the reader parses chunk k+1 while chunk
+    k is scored and chunk k-1 is written. The model kernel, the CSV parser
+    and Parquet I/O release the GIL, so the stages genuinely overlap.
+    Returns a summary dict with row count, wall time and per-stage busy time.
+    """
+    passthrough = list(passthrough)
+    columns = scorer.input_columns()
+    columns += [name for name in passthrough if name not in columns]
+    schema = scorer.output_schema(passthrough_fields(input_path, passthrough)) if is_parquet(output_path) else None
+    to_score = queue.Queue(maxsize=QUEUE_DEPTH)
+    to_write = queue.Queue(maxsize=QUEUE_DEPTH)
+    stop = threading.Event()
+    errors = []
+    busy = {'read': 0.0, 'score': 0.0, 'write': 0.0}
+    done = object()
+
+    def run_stage(body):
+        try:
+            body()
+        except _StageFailed:
+            pass
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    def reader():
+        chunks = read_chunks(input_path, columns, chunk_size)
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            busy['read'] += time.perf_counter() - started
+            if chunk is None:
+                break
+            _put(to_score, chunk, stop)
+        _put(to_score, done, stop)
+
+    def writer():
+        output = ChunkWriter(output_path, schema=schema)
+        try:
+            while True:
+                result = _get(to_write, stop)
+                if result is done:
+                    break
+                started = time.perf_counter()
+                output.write(result)
+                busy['write'] += time.perf_counter() - started
+        finally:
+            output.close()
+
+    threads = [threading.Thread(target=run_stage, args=(body,), name=f"score-{name}", daemon=True)
+               for name, body in (('read', reader), ('write', writer))]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    n_rows = 0
+    last_report = started_at
+
+    def scorer_stage():
+        nonlocal n_rows, last_report
+        while True:
+            chunk = _get(to_score, stop)
+            if chunk is done:
+                break
+            started = time.perf_counter()
+            scored = _score_chunk(scorer, chunk, passthrough)
+            busy['score'] += time.perf_counter() - started
+            _put(to_write, scored, stop)
+
+            n_rows += len(chunk)
+            now = time.perf_counter()
+            if progress_interval and now - last_report >= progress_interval:
+                last_report = now
+                log(f"   {n_rows:,} rows scored ({n_rows / (now - started_at):,.0f} rows/s)")
+        _put(to_write, done, stop)
+
+    run_stage(scorer_stage)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+    elapsed = time.perf_counter() - started_at
+    return {
+        'rows': n_rows,
+        'seconds': elapsed,
+        'rows_per_second': n_rows / elapsed if elapsed > 0 else 0.0,
+        'busy_seconds': busy
+    }
+
+
+# Per-process scorer for parallel scoring, set by _init_worker
+_worker_scorer = None
+
+
+def _init_worker(bundle_path, rules_path, backend, action_format):
+    """Load the scorer once per worker; the bundle's arrays are mmap'd, so
+    every worker shares one copy of the model in the page cache"""
+    global _worker_scorer
+    _worker_scorer = BulkScorer(bundle_path, rules_path, backend, action_format=action_format)
+
+
+def has_multiline_fields(path, block_bytes=1 << 24):
+    """True if a newline in the CSV falls inside a quoted field.
+
+    A newline is quoted when an odd number of quote characters precede it
+    (escaped quotes come in pairs, so they don't change the parity). One
+    pass over the file, a block at a time.
+    """
+    inside = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_bytes), b''):
+            data = np.frombuffer(block, dtype=np.uint8)
+            quotes = np.flatnonzero(data == ord('"'))
+            newlines = np.flatnonzero(data == ord('\n'))
+            if ((np.searchsorted(quotes, newlines) + inside) & 1).any():
+                return True
+            inside = (inside + len(quotes)) & 1
+    return False
+
+
+def passthrough_fields(input_path, passthrough):
+    """Arrow fields of the passthrough columns the input has, in passthrough order.
+
+    Parquet inputs give their own types; CSV types are inferred from the
+    first rows, with empty columns as strings.
+    """
+    require_pyarrow(input_path)
+    if is_parquet(input_path):
+        schema = pq.ParquetFile(input_path).schema_arrow
+    else:
+        sample = pd.read_csv(input_path, usecols=lambda name: name in passthrough, nrows=PASSTHROUGH_SAMPLE_ROWS)
+        schema = pa.Schema.from_pandas(sample, preserve_index=False)
+    fields = {field.name: field.with_type(pa.string()) if field.type == pa.null() else field for field in schema
+              if field.name in passthrough}
+    return [fields[name] for name in passthrough if name in fields]
+
+
+def plan_partitions(path, partition_bytes=DEFAULT_PARTITION_MB * 1024 * 1024):
+    """Split an input file into independently readable partitions.
+
+    CSV files are cut into byte ranges (a partition owns every line that
+    starts inside its range); Parquet files are split by row group.
+    Returns None for inputs that can't be split: compressed CSV, and CSV
+    with quoted fields spanning lines, whose records a byte range could cut.
+    """
+    if is_parquet(path):
+        require_pyarrow(path)
+        return [('parquet', path, i) for i in range(pq.ParquetFile(path).num_row_groups)]
+    if path.lower().endswith(('.gz', '.bz2', '.zip', '.xz', '.zst')):
+        return None
+    if has_multiline_fields(path):
+        return None
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+    header = next(csv.reader([header_line.decode('utf-8-sig')]))
+    starts = list(range(data_start, size, max(1, int(partition_bytes)))) or [data_start]
+    return [('csv', path, start, min(start + int(partition_bytes), size), header) for start in starts]
+
+
+def _read_partition(partition, columns):
+    wanted = set(columns)
+    if partition[0] == 'parquet':
+        _, path, row_group = partition
+        parquet_file = pq.ParquetFile(path)
+        present = [name for name in parquet_file.schema_arrow.names if name in wanted]
+        return parquet_file.read_row_group(row_group, columns=present).to_pandas()
+
+    _, path, start, end, header = partition
+    with open(path, 'rb') as f:
+        # Back up one byte and skip to the next line start: a line that began
+        # before `start` belongs to the previous partition
+        f.seek(start - 1)
+        f.readline()
+        data = f.read(max(0, end - f.tell()))
+        if data and not data.endswith(b'\n'):
+            data += f.readline()
+    if not data.strip():
+        return pd.DataFrame({name: pd.Series(dtype=object) for name in header if name in wanted})
+    return pd.read_csv(io.BytesIO(data), header=None, names=header, usecols=lambda name: name in wanted,
+                       dtype={'channel': str})
+
+
+def _score_partition(partition, columns, passthrough, output_parquet):
+    """Read, score and encode one partition inside a worker.
+
+    Returns (rows, encoded, read seconds, score seconds). Encoding happens
+    here so the parent only appends: an Arrow table for Parquet output,
+    CSV bytes (with header) otherwise.
+    """
+    started = time.perf_counter()
+    chunk = _read_partition(partition, columns)
+    read_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scored = _score_chunk(_worker_scorer, chunk, passthrough)
+    if output_parquet:
+        encoded = pa.Table.from_pandas(scored, preserve_index=False)
+    elif pa is not None:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(pa.Table.from_pandas(scored, preserve_index=False), sink)
+        encoded = sink.getvalue().to_pybytes()
+    else:
+        encoded = scored.to_csv(index=False).encode('utf-8')
+    return len(chunk), encoded, read_seconds, time.perf_counter() - started
+
+
+def score_file_parallel(input_path, output_path, bundle_path=DEFAULT_BUNDLE_PATH, rules_path=None,
+                        backend=None, action_format='names', workers=None,
+                        partition_bytes=DEFAULT_PARTITION_MB * 1024 * 1024,
+                        passthrough=('customer_id',), progress_interval=5.0, log=print):
+    """Score `input_path` across a pool of worker processes, writing output in input order.
+
+    Each worker loads the model bundle once (memory-mapped, so the model is
+    shared rather than copied) and then reads, scores and encodes whole
+    partitions on its own; the parent only appends finished partitions.
+    At most 2 partitions per worker are in flight, which bounds memory.
+    Returns the same summary as score_file, or None if the input can't be
+    partitioned.
+    """
+    partitions = plan_partitions(input_path, partition_bytes)
+    if partitions is None:
+        return None
+    workers = workers or os.cpu_count() or 1
+    output_parquet = is_parquet(output_path)
+    if output_parquet:
+        require_pyarrow(output_path)
+    passthrough = list(passthrough)
+    scorer = BulkScorer(bundle_path, rules_path, backend, action_format)
+    columns = scorer.input_columns()
+    columns += [name for name in passthrough if name not in columns]
+    # Fixed up front: a partition with no rows would otherwise give null-typed columns
+    schema = scorer.output_schema(passthrough_fields(input_path, passthrough)) if output_parquet else None
+
+    busy = {'read': 0.0, 'score': 0.0, 'write': 0.0}
+    n_rows = 0
+    started_at = time.perf_counter()
+    last_report = started_at
+    parquet_writer = None
+    csv_output = None if output_parquet else open(output_path, 'wb')
+
+    def write_next(future):
+        nonlocal n_rows, last_report, parquet_writer
+        rows, encoded, read_seconds, score_seconds = future.result()
+        started = time.perf_counter()
+        if output_parquet:
+            if parquet_writer is None:
+                parquet_writer = pq.ParquetWriter(output_path, schema)
+            parquet_writer.write_table(encoded.cast(schema))
+        else:
+            # Every partition carries a header; keep only the first one
+            csv_output.write(encoded if csv_output.tell() == 0 else encoded[encoded.index(b'\n') + 1:])
+        busy['write'] += time.perf_counter() - started
+        busy['read'] += read_seconds
+        busy['score'] += score_seconds
+        n_rows += rows
+        now = time.perf_counter()
+        if progress_interval and now - last_report >= progress_interval:
+            last_report = now
+            log(f"   {n_rows:,} rows scored ({n_rows / (now - started_at):,.0f} rows/s)")
+
+    # spawn like the API's process pool: workers import only what scoring needs
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker, initargs=(bundle_path, rules_path, backend, action_format)
+    )
+    try:
+        pending = deque()
+        for partition in partitions:
+            pending.append(executor.submit(_score_partition, partition, columns, passthrough, output_parquet))
+            # Write finished partitions in input order, blocking once the window is full
+            while pending and (len(pending) >= 2 * workers or pending[0].done()):
+                write_next(pending.popleft())
+        while pending:
+            write_next(pending.popleft())
+    finally:
+        executor.shutdown(cancel_futures=True)
+        if parquet_writer is not None:
+            parquet_writer.close()
+        if csv_output is not None:
+            csv_output.close()
+
+    elapsed = time.perf_counter() - started_at
+    return {
+        'rows': n_rows,
+        'seconds': elapsed,
+        'rows_per_second': n_rows / elapsed if elapsed > 0 else 0.0,
+        'busy_seconds': busy,
+        'workers': workers,
+        'partitions': len(partitions)
+    }
+
+
+def score_command(args):
+    summary = None
+    if args.workers != 1:
+        workers = args.workers or os.cpu_count() or 1
+        print(f"🔄 Scoring {args.input} -> {args.output} with {workers} worker processes")
+        summary = score_file_parallel(
+            args.input, args.output, args.bundle, args.rules, args.backend, args.actions,
+            workers=workers, partition_bytes=args.partition_mb * 1024 * 1024,
+            passthrough=args.keep, progress_interval=args.progress_interval
+        )
+        if summary is None:
+            print("⚠️  Compressed CSV, or CSV with quoted fields spanning lines, can't be split by byte "
+                  "range; scoring in a single process")
+    if summary is None:
+        scorer = BulkScorer(args.bundle, args.rules, args.backend, action_format=args.actions)
+        print(f"🔄 Scoring {args.input} -> {args.output} "
+              f"(model {scorer.model_version}, rules {scorer.rules.version}, chunks of {args.chunk_size:,})")
+        summary = score_file(args.input, args.output, scorer, chunk_size=args.chunk_size,
+                             passthrough=args.keep, progress_interval=args.progress_interval)
+    busy = summary['busy_seconds']
+    print(f"✅ Scored {summary['rows']:,} rows in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_second']:,.0f} rows/s)")
+    print(f"   Stage busy time: read {busy['read']:.2f}s, score {busy['score']:.2f}s, "
+          f"write {busy['write']:.2f}s")
+
+
+def generate_command(args):
+    options = dict(seed=args.seed, profile=args.profile, compact=args.compact, chunk_rows=args.chunk_rows)
+    started_at = time.perf_counter()
+    if args.shard_rows:
+        print(f"🔄 Generating {args.rows:,} {args.profile} customers into {args.output}/ "
+              f"({args.format} shards of {args.shard_rows:,} rows, {args.workers} workers, seed {args.seed})")
+        shards = synthetic_data.write_shards(args.output, args.rows, args.shard_rows, fmt=args.format,
+                                             workers=args.workers or os.cpu_count() or 1, **options)
+        written = sum(rows for _, rows in shards)
+    else:
+        print(f"🔄 Generating {args.rows:,} {args.profile} customers into {args.output} (seed {args.seed})")
+        written = synthetic_data.write_dataset(args.output, args.rows, **options)
+    elapsed = time.perf_counter() - started_at
+    print(f"✅ Wrote {written:,} rows in {elapsed:.2f}s ({written / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn model command-line tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help="Score a CSV/Parquet customer file in streaming chunks")
+    score.add_argument('input', help="customer file (.csv, .csv.gz, .parquet)")
+    score.add_argument('output', help="scores file; .parquet/.pq writes Parquet, anything else CSV")
+    score.add_argument('--bundle', default=DEFAULT_BUNDLE_PATH, help="model bundle to score with")
+    score.add_argument('--rules', default=os.getenv("RETENTION_RULES_PATH"),
+                       help="retention rule file (default: Haryana rules)")
+    score.add_argument('--backend', default=None, help="tree engine backend (numba, numpy, xgboost)")
+    score.add_argument('--actions', choices=ACTION_FORMATS, default='names',
+                       help="write action names (default), the full action JSON, or no actions")
+    score.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk")
+    score.add_argument('--workers', type=int, default=1,
+                       help="worker processes; 1 streams in this process, 0 uses every core")
+    score.add_argument('--partition-mb', type=float, default=DEFAULT_PARTITION_MB,
+                       help="CSV byte-range size per parallel task (Parquet splits by row group)")
+    score.add_argument('--keep', nargs='*', default=['customer_id'],
+                       help="input columns copied to the output (default: customer_id)")
+    score.add_argument('--progress-interval', type=float, default=5.0,
+                       help="seconds between progress lines (0 disables)")
+    score.set_defaults(func=score_command)
+
+    generate = commands.add_parser('generate', help="Write seeded synthetic customers for load testing")
+    generate.add_argument('output', help="output file (.csv/.parquet), or a directory with --shard-rows")
+    generate.add_argument('--rows', type=int, default=1_000_000, help="number of customers")
+    generate.add_argument('--profile', choices=synthetic_data.PROFILES, default='haryana',
+                          help="haryana (train_model.py columns) or enhanced (churn_prediction_system.py)")
+    generate.add_argument('--seed', type=int, default=42)
+    generate.add_argument('--compact', action='store_true',
+                          help="store int8/int16/float32 columns and a categorical channel")
+    generate.add_argument('--chunk-rows', type=int, default=synthetic_data.DEFAULT_CHUNK_ROWS,
+                          help="rows generated and written at a time")
+    generate.add_argument('--shard-rows', type=int, default=None,
+                          help="write part-NNNNN files of this many rows into the output directory")
+    generate.add_argument('--format', choices=('parquet', 'csv'), default='parquet', help="shard format")
+    generate.add_argument('--workers', type=int, default=1,
+                          help="processes writing shards in parallel (0 uses every core)")
+    generate.set_defaults(func=generate_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
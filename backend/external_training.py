@@ -0,0 +1,258 @@
+"""
+Out-of-core XGBoost training from chunked customer files
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feature_plan import CHANNEL_CLASSES, CHANNEL_FEATURE
+from tabular_io import PARQUET_SUFFIXES, is_parquet, pq, read_chunks, require_pyarrow
+from tuning import BEST_PARAMS_PATH, load_hyperparameters
+
+DEFAULT_CHUNK_ROWS = 500_000
+# Share of rows kept out of training to choose decision cutoffs on (the risk bands)
+DEFAULT_VALIDATION_SIZE = 0.1
+DATA_SUFFIXES = PARQUET_SUFFIXES + ('.csv', '.csv.gz')
+# Columns of customer files that are never model inputs (churn_prob is the
+# synthetic Haryana label score, so it would leak the target)
+NON_FEATURE_COLUMNS = ('customer_id', 'churned', 'channel', 'churn_prob')
+# Native xgboost params for when best_params.json has no XGBoost entry (the same
+# values as tuning.DEFAULT_HYPERPARAMETERS['xgboost']); xgboost_params() layers the
+# tuned hyperparameters over them
+XGB_PARAMS = {
+    'objective': 'binary:logistic',
+    'eval_metric': 'logloss',
+    'max_depth': 6,
+    'learning_rate': 0.05,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'tree_method': 'hist',
+    'seed': 42
+}
+N_ROUNDS = 200
+# Rows go to the test or validation set by a multiplicative hash of their
+# position (Fibonacci hashing), so the split does not depend on chunk sizes
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def expand_paths(paths):
+    """Files to read, in order; a directory stands for its data files (e.g. part-*.parquet shards)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith(DATA_SUFFIXES)))
+        else:
+            files.append(path)
+    if not files:
+        raise ValueError(f"No CSV or Parquet files found in {paths}")
+    return files
+
+
+def infer_feature_names(path):
+    """Feature columns of a customer file in training order: numeric columns, then channel_encoded"""
+    if is_parquet(path):
+        require_pyarrow(path)
+        columns = pq.ParquetFile(path).schema_arrow.names
+    else:
+        columns = pd.read_csv(path, nrows=0).columns
+    return [name for name in columns if name not in NON_FEATURE_COLUMNS] + [CHANNEL_FEATURE]
+
+
+def xgboost_params(path=BEST_PARAMS_PATH):
+    """ChurnPredictionModel.train_xgboost's hyperparameters as (native xgboost params, boosting rounds)"""
+    hyperparameters = load_hyperparameters('xgboost', path)
+    n_rounds = int(hyperparameters.pop('n_estimators', N_ROUNDS))
+    # The sklearn names the tuner writes (learning_rate, reg_lambda, ...) are native aliases
+    return dict(XGB_PARAMS, **hyperparameters), n_rounds
+
+
+def xgb_classifier(params, n_rounds):
+    """XGBClassifier with the same hyperparameters as native params trained for n_rounds"""
+    params = dict(params)
+    params.pop('objective', None)
+    return xgb.XGBClassifier(n_estimators=n_rounds, random_state=params.pop('seed', None), **params)
+
+
+def test_mask(positions, test_size):
+    """Deterministic ~test_size share of row positions, independent of how the rows are chunked"""
+    fraction = (positions * _GOLDEN) >> np.uint64(11)
+    return fraction < np.uint64(test_size * 2.0 ** 53)
+
+
+def validation_mask(positions, test_size, validation_size):
+    """Deterministic ~validation_size share of row positions, disjoint from test_mask's"""
+    return test_mask(positions, test_size + validation_size) & ~test_mask(positions, test_size)
+
+
+def iter_feature_chunks(paths, feature_names, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield (X raw float64, y, row positions) per chunk of every file"""
+    columns = [name for name in feature_names if name != CHANNEL_FEATURE] + ['channel', 'churned']
+    channel_index = pd.Index(CHANNEL_CLASSES)
+    for file_index, path in enumerate(paths):
+        row = 0
+        for chunk in read_chunks(path, columns, chunk_rows):
+            X = np.empty((len(chunk), len(feature_names)), dtype=np.float64)
+            for j, name in enumerate(feature_names):
+                if name == CHANNEL_FEATURE:
+                    codes = channel_index.get_indexer(chunk['channel'])
+                    if (codes < 0).any():
+                        raise ValueError(f"{path}: unknown channel values "
+                                         f"{sorted(set(chunk['channel'][codes < 0]))}")
+                    X[:, j] = codes
+                else:
+                    X[:, j] = chunk[name].to_numpy()
+            positions = np.arange(row, row + len(chunk), dtype=np.uint64) + np.uint64(file_index << 40)
+            row += len(chunk)
+            yield X, chunk['churned'].to_numpy(dtype=np.float64), positions
+
+
+def iter_training_rows(paths, feature_names, chunk_rows, test_size, validation_size=0.0):
+    """Rows of every chunk that are in neither the test nor the validation set"""
+    for X, y, positions in iter_feature_chunks(paths, feature_names, chunk_rows):
+        keep = ~test_mask(positions, test_size + validation_size)
+        if keep.any():
+            yield X[keep], y[keep]
+
+
+class ScaledChunkIter(xgb.DataIter):
+    """Feeds the training rows of chunked files to xgboost, standardized chunk by chunk.
+
+    Only one chunk is held at a time; xgboost keeps the quantized pages
+    (in memory for QuantileDMatrix, in cache files for ExtMemQuantileDMatrix).
+    """
+
+    def __init__(self, paths, feature_names, scaler, chunk_rows=DEFAULT_CHUNK_ROWS, test_size=0.2,
+                 validation_size=0.0, cache_prefix=None):
+        self.paths = paths
+        self.feature_names = feature_names
+        self.scaler = scaler
+        self.chunk_rows = chunk_rows
+        self.test_size = test_size
+        self.validation_size = validation_size
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = iter_training_rows(self.paths, self.feature_names, self.chunk_rows, self.test_size,
+                                              self.validation_size)
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        X, y = chunk
+        # StandardScaler.transform's arithmetic, in place
+        X -= self.scaler.mean_
+        X /= self.scaler.scale_
+        input_data(data=X, label=y)
+        return True
+
+    def reset(self):
+        self._chunks = None
+
+
+def train_xgboost_external(paths, feature_names=None, chunk_rows=DEFAULT_CHUNK_ROWS, test_size=0.2,
+                           validation_size=DEFAULT_VALIDATION_SIZE, external_memory=True, cache_dir=None,
+                           params=None, n_rounds=None, n_check_rows=20_000):
+    """Train ChurnPredictionModel's XGBoost on files too large to load at once.
+
+    Three streaming passes over the files: fit the scaler on the training
+    rows (StandardScaler.partial_fit), quantize them through ScaledChunkIter
+    and train, then score the validation and test rows. With external_memory
+    the quantized pages are spilled to cache_dir (default: a temporary
+    directory), so memory stays bounded by the chunk size rather than the
+    row count.
+
+    params and n_rounds default to xgboost_params(), i.e. best_params.json's
+    XGBoost entry; explicit params are layered over XGB_PARAMS instead.
+
+    Returns a dict with the XGBClassifier (trained on scaled rows, like
+    model.pkl), the scaler, feature names, test metrics, the labels and
+    predictions of the validation rows (y_validation, p_validation) and
+    test rows (y_test, p_test), up to n_check_rows raw test rows for export
+    checks, row counts and stage timings.
+    """
+    paths = expand_paths(paths)
+    feature_names = list(feature_names or infer_feature_names(paths[0]))
+    timings = {}
+
+    started_at = time.perf_counter()
+    scaler = StandardScaler()
+    for X, _ in iter_training_rows(paths, feature_names, chunk_rows, test_size, validation_size):
+        scaler.partial_fit(X)
+    n_train = int(np.max(scaler.n_samples_seen_))
+    timings['scaler_pass'] = time.perf_counter() - started_at
+
+    tuned_params, tuned_rounds = xgboost_params()
+    params = tuned_params if params is None else dict(XGB_PARAMS, **params)
+    n_rounds = n_rounds or tuned_rounds
+    started_at = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=cache_dir, prefix='xgb-extmem-') as tmp:
+        if external_memory:
+            data_iter = ScaledChunkIter(paths, feature_names, scaler, chunk_rows, test_size, validation_size,
+                                        cache_prefix=os.path.join(tmp, 'cache'))
+            dtrain = xgb.ExtMemQuantileDMatrix(data_iter, max_bin=256)
+        else:
+            data_iter = ScaledChunkIter(paths, feature_names, scaler, chunk_rows, test_size, validation_size)
+            dtrain = xgb.QuantileDMatrix(data_iter, max_bin=256)
+        timings['quantize'] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        booster = xgb.train(params, dtrain, num_boost_round=n_rounds)
+        timings['train'] = time.perf_counter() - started_at
+        del dtrain
+
+    # Same estimator model.pkl holds, so the export and serving paths are unchanged
+    model = xgb_classifier(params, n_rounds)
+    model.load_model(bytearray(booster.save_raw(raw_format='ubj')))
+
+    started_at = time.perf_counter()
+    scored = {'validation': ([], []), 'test': ([], [])}
+    check_rows = []
+    n_check = 0
+    for X, y, positions in iter_feature_chunks(paths, feature_names, chunk_rows):
+        masks = {'validation': validation_mask(positions, test_size, validation_size),
+                 'test': test_mask(positions, test_size)}
+        keep = masks['validation'] | masks['test']
+        if not keep.any():
+            continue
+        X, y = X[keep], y[keep]
+        if n_check < n_check_rows:
+            check_rows.append(X[masks['test'][keep]][:n_check_rows - n_check])
+            n_check += len(check_rows[-1])
+        X -= scaler.mean_
+        X /= scaler.scale_
+        p = booster.inplace_predict(X)
+        for part, mask in masks.items():
+            scored[part][0].append(y[mask[keep]])
+            scored[part][1].append(p[mask[keep]])
+    (y_validation, p_validation), (y_test, p_test) = (
+        (np.concatenate(labels), np.concatenate(probs)) for labels, probs in scored.values())
+    timings['evaluate'] = time.perf_counter() - started_at
+
+    return {
+        'model': model,
+        'scaler': scaler,
+        'feature_names': feature_names,
+        'metrics': {
+            'roc_auc': roc_auc_score(y_test, p_test),
+            'accuracy': accuracy_score(y_test, p_test > 0.5)
+        },
+        'X_check_raw': np.vstack(check_rows),
+        'y_validation': y_validation,
+        'p_validation': p_validation,
+        'y_test': y_test,
+        'p_test': p_test,
+        'n_train': n_train,
+        'n_validation': len(y_validation),
+        'n_test': len(y_test),
+        'timings': timings
+    }
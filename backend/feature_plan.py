@@ -0,0 +1,116 @@
+"""
+Precompiled feature plan for the serving hot path
+"""
+from operator import attrgetter
+import threading
+import numpy as np
+
+CHANNEL_CLASSES = ['app', 'mobile', 'web']
+CHANNEL_FEATURE = 'channel_encoded'
+
+
+class FeaturePlan:
+    """Map CustomerData fields straight onto model-ready NumPy rows.
+
+    Built once when artifacts are loaded. Replaces the per-request DataFrame,
+    column reindex, LabelEncoder and StandardScaler.transform with an
+    attribute getter, a dict lookup and a fused multiply-add.
+    """
+
+    def __init__(self, feature_names, channel_classes=CHANNEL_CLASSES, mean=None, scale=None):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.channel_codes = {name: code for code, name in enumerate(channel_classes)}
+        self.channel_classes = list(channel_classes)
+
+        self.channel_index = (self.feature_names.index(CHANNEL_FEATURE)
+                              if CHANNEL_FEATURE in self.feature_names else None)
+        fields = [name for name in self.feature_names if name != CHANNEL_FEATURE]
+        self.field_index = np.array([self.feature_names.index(name) for name in fields], dtype=np.intp)
+        self._get_fields = attrgetter(*fields)
+
+        # StandardScaler folded into one affine step: x * coef + offset
+        if mean is not None and scale is not None:
+            scale = np.asarray(scale, dtype=np.float64)
+            self.coef = (1.0 / scale).reshape(1, -1)
+            self.offset = (-np.asarray(mean, dtype=np.float64) / scale).reshape(1, -1)
+        else:
+            self.coef = None
+            self.offset = None
+
+        # Per-thread row buffer reused by every single-row call on that thread
+        self._local = threading.local()
+
+    @classmethod
+    def from_scaler(cls, feature_names, scaler, channel_classes=CHANNEL_CLASSES):
+        """Build a plan from a fitted StandardScaler (or None for unscaled models)"""
+        if scaler is None:
+            return cls(feature_names, channel_classes)
+        mean = scaler.mean_ if getattr(scaler, 'with_mean', True) else np.zeros(len(feature_names))
+        scale = scaler.scale_ if getattr(scaler, 'with_std', True) else np.ones(len(feature_names))
+        return cls(feature_names, channel_classes, mean=mean, scale=scale)
+
+    def encode_channel(self, channel):
+        """Encode a channel name, rejecting values unseen in training"""
+        try:
+            return self.channel_codes[channel]
+        except KeyError:
+            raise ValueError(f"Unknown channel '{channel}', expected one of {self.channel_classes}")
+
+    def transform_row(self, customer):
+        """Return the scaled (1, n_features) row for one customer.
+
+        The returned array is this thread's preallocated buffer, so it must be
+        consumed before the next call on the same thread.
+        """
+        row = getattr(self._local, 'row', None)
+        if row is None:
+            row = self._local.row = np.empty((1, self.n_features), dtype=np.float64)
+        row[0, self.field_index] = self._get_fields(customer)
+        if self.channel_index is not None:
+            row[0, self.channel_index] = self.encode_channel(customer.channel)
+        if self.coef is not None:
+            np.multiply(row, self.coef, out=row)
+            np.add(row, self.offset, out=row)
+        return row
+
+    def encode_row(self, customer):
+        """Return a new raw (unscaled) float64 (1, n_features) row for one customer"""
+        row = np.empty((1, self.n_features), dtype=np.float64)
+        row[0, self.field_index] = self._get_fields(customer)
+        if self.channel_index is not None:
+            row[0, self.channel_index] = self.encode_channel(customer.channel)
+        return row
+
+    def encode_matrix(self, customers, dtype=np.float32):
+        """Assemble raw (unscaled) features into one contiguous matrix (float32 by default)"""
+        X = np.empty((len(customers), self.n_features), dtype=dtype)
+        if not customers:
+            return X
+
+        get_fields = self._get_fields
+        X[:, self.field_index] = np.array([get_fields(customer) for customer in customers], dtype=dtype)
+        if self.channel_index is not None:
+            codes = self.channel_codes
+            X[:, self.channel_index] = [codes[customer.channel] for customer in customers]
+        return X
+
+    def columns(self, X):
+        """Name -> column views of a raw matrix, with the channel decoded back to names"""
+        columns = {name: X[:, j] for j, name in enumerate(self.feature_names)}
+        if self.channel_index is not None:
+            codes = X[:, self.channel_index].astype(np.intp)
+            columns['channel'] = np.asarray(self.channel_classes)[codes]
+        return columns
+
+    def scale_matrix(self, X):
+        """Apply the fused scaler to a raw matrix.
+
+        Returns a new float64 matrix, or X itself when the model takes raw rows.
+        """
+        if self.coef is None:
+            return X
+        X_scaled = X.astype(np.float64)
+        X_scaled *= self.coef
+        X_scaled += self.offset
+        return X_scaled
@@ -1,15 +1,33 @@
 """
 FastAPI Backend for Churn Prediction ML Model
 """
-from fastapi import FastAPI, HTTPException
+import time
+# Taken before the imports below so /health can report full process startup time
+IMPORT_STARTED_AT = time.perf_counter()
+
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import joblib
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timezone
+import asyncio
+import hmac
+import multiprocessing
 import json
 import numpy as np
-import pandas as pd
-from sklearn.preprocessing import LabelEncoder
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feature_plan import FeaturePlan, CHANNEL_CLASSES
+from tree_engine import CompiledForest, default_backend
+from model_bundle import ModelBundle, model_version_of
+from batcher import PredictionBatcher
+from prediction_cache import create_prediction_cache, make_cache_key
+from retention_rules import load_rules, HARYANA_RULES_PATH
+from risk_bands import risk_cutoffs_of, risk_level
 
 app = FastAPI(title="Churn Prediction API")
 
@@ -38,39 +56,61 @@ app.add_middleware(
 )
 
 # Load model, scaler, and feature names
+# Single-file bundle (memory-mapped; preferred when present)
+MODEL_BUNDLE_PATH = os.getenv("MODEL_BUNDLE", os.path.join(os.path.dirname(__file__), "model.bundle"))
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "model.pkl")
 SCALER_PATH = os.path.join(os.path.dirname(__file__), "scaler.pkl")
+# XGBoost model with the scaler folded into its split thresholds (takes raw rows)
+UNSCALED_MODEL_PATH = os.path.join(os.path.dirname(__file__), "model_unscaled.json")
 FEATURE_NAMES_PATH = os.path.join(os.path.dirname(__file__), "feature_names.json")
+# Retention strategy rule table (JSON); reloaded together with the model
+RETENTION_RULES_PATH = os.getenv("RETENTION_RULES_PATH", HARYANA_RULES_PATH)
+
+# Upper bound on records accepted by /predict/batch in a single request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "50000"))
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonlines")
+
+# Tree engine backend for XGBoost models: numpy, numba or xgboost
+TREE_ENGINE_BACKEND = os.getenv("TREE_ENGINE_BACKEND", default_backend())
+
+# Coalesce concurrent /predict calls into one model call (PREDICT_BATCHING=0 to disable)
+PREDICT_BATCHING = os.getenv("PREDICT_BATCHING", "1") == "1"
+PREDICT_BATCH_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64"))
+PREDICT_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "2"))
+
+# Run inference off the event loop: thread, process (model preloaded per worker) or none
+INFERENCE_POOL = os.getenv("INFERENCE_POOL", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+# Threads each worker may give xgboost/sklearn so workers don't oversubscribe the cores
+INFERENCE_NTHREAD = int(os.getenv("INFERENCE_NTHREAD", str(max(1, (os.cpu_count() or 1) // max(1, INFERENCE_WORKERS)))))
+
+# Hot reload: poll the artifact files every N seconds (0 = off); ADMIN_TOKEN enables /admin/reload
+MODEL_WATCH_INTERVAL_S = float(os.getenv("MODEL_WATCH_INTERVAL_S", "0"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+# Max |p - expected| on the bundle's canary rows before a new model may go live
+CANARY_ATOL = float(os.getenv("CANARY_ATOL", "1e-5"))
+
+# Cache /predict responses by encoded row + model version: memory, redis (shared) or none
+PREDICTION_CACHE = os.getenv("PREDICTION_CACHE", "memory")
+PREDICTION_CACHE_MAX_MB = float(os.getenv("PREDICTION_CACHE_MAX_MB", "64"))
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", "3600"))
+PREDICTION_CACHE_REDIS_URL = os.getenv("PREDICTION_CACHE_REDIS_URL", "redis://localhost:6379/0")
 
+serving = None
+batcher = None
+prediction_cache = None
+executor = None
+watcher = None
+reload_lock = None
+startup_timings = {}
+
+# Kept in sync with `serving` for scripts that read them directly
 model = None
 scaler = None
 feature_names = None
-label_encoder = None
-
-def load_artifacts():
-    """Load model, scaler, and feature names"""
-    global model, scaler, feature_names, label_encoder
-    
-    try:
-        model = joblib.load(MODEL_PATH)
-        scaler = joblib.load(SCALER_PATH)
-        
-        with open(FEATURE_NAMES_PATH, 'r') as f:
-            feature_names = json.load(f)
-        
-        # Initialize label encoder for channel
-        label_encoder = LabelEncoder()
-        label_encoder.classes_ = np.array(['app', 'mobile', 'web'])
-        
-        print("✅ Model artifacts loaded successfully")
-    except Exception as e:
-        print(f"❌ Error loading artifacts: {e}")
-        raise
-
-# Load artifacts on startup
-@app.on_event("startup")
-async def startup_event():
-    load_artifacts()
+feature_plan = None
+bundle = None
+artifact_source = None
 
 # Request/Response Models
 class CustomerData(BaseModel):
@@ -97,160 +137,593 @@ class PredictionResponse(BaseModel):
     churn_probability: float
     risk_level: str
     actions: list
+    model_version: Optional[str] = None
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    churn_probability: Optional[float] = None
+    risk_level: Optional[str] = None
+    actions: Optional[list] = None
+    errors: Optional[list] = None
+
+class BatchPredictionResponse(BaseModel):
+    n_records: int
+    n_scored: int
+    n_failed: int
+    results: List[BatchPredictionItem]
+    model_version: Optional[str] = None
+
+class RequestRejected(Exception):
+    """Client error raised on an inference worker.
+
+    HTTPException can't cross a process pool (it doesn't unpickle), so
+    workers raise this and the endpoint turns it into an HTTP error.
+    """
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+class ServingModel:
+    """One loaded model version and everything needed to score with it.
+
+    Treated as immutable once live. Requests read the `serving` global once and
+    use that object throughout, so a reload that rebinds `serving` lets
+    in-flight requests finish on the version they started with.
+    """
+    def __init__(self, model, scaler, feature_names, feature_plan, source, version, rules, bundle=None):
+        self.model = model
+        self.scaler = scaler
+        self.feature_names = feature_names
+        self.feature_plan = feature_plan
+        self.source = source
+        self.version = version
+        self.rules = rules
+        self.bundle = bundle
+        # Risk-band cutoffs optimized at training time, else the 0.7 / 0.4 defaults
+        self.risk_cutoffs = risk_cutoffs_of(bundle.metadata if bundle is not None else None)
+        self.loaded_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.timings = {}
+        # Process pool whose workers loaded this version (INFERENCE_POOL=process)
+        self.executor = None
+    
+    @property
+    def identity(self) -> tuple:
+        """What a reload must change to count as a new serving state: model, rules and risk cutoffs"""
+        return self.version, self.rules.version, self.risk_cutoffs['high'], self.risk_cutoffs['medium']
+    
+    def __reduce__(self):
+        # Sent to a process worker: resolve to the copy that worker loaded itself
+        return (_worker_serving_model, self.identity)
+    
+    def build_feature_matrix(self, customers: List[CustomerData]) -> np.ndarray:
+        """Assemble customers into one contiguous float32 matrix in feature_names order"""
+        return self.feature_plan.encode_matrix(customers)
+    
+    def predict_proba_scaled(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Return churn probabilities for already-scaled rows"""
+        if isinstance(self.model, CompiledForest):
+            return self.model.predict(X_scaled)
+        if hasattr(self.model, 'predict_proba'):
+            return self.model.predict_proba(X_scaled)[:, 1]
+        # Neural network
+        return self.model.predict(X_scaled, verbose=0).reshape(-1)
+    
+    def predict_proba_matrix(self, X: np.ndarray) -> np.ndarray:
+        """Scale a raw feature matrix and return churn probabilities in row order"""
+        # Scale in float64 like the single-row path so split decisions match
+        return self.predict_proba_scaled(self.feature_plan.scale_matrix(X))
+    
+    def predict_customer(self, customer: CustomerData) -> float:
+        """Score one customer through the single-row hot path"""
+        # Encode, order and scale features with the precompiled plan
+        return float(self.predict_proba_scaled(self.feature_plan.transform_row(customer))[0])
+    
+    def score_batch(self, body: bytes, content_type: str) -> BatchPredictionResponse:
+        """Parse, validate and score a batch body; runs on the inference pool"""
+        records = parse_batch_records(body, content_type)
+        if len(records) > MAX_BATCH_SIZE:
+            raise RequestRejected(413, f"Batch of {len(records)} records exceeds MAX_BATCH_SIZE={MAX_BATCH_SIZE}")
+        
+        # Validate each record on its own so one bad row doesn't sink the batch
+        results = [BatchPredictionItem(index=i) for i in range(len(records))]
+        valid_idx = []
+        customers = []
+        for i, record in enumerate(records):
+            if isinstance(record, Exception):
+                results[i].errors = [{"type": "json_invalid", "msg": str(record)}]
+                continue
+            try:
+                customer = CustomerData.model_validate(record)
+            except ValidationError as e:
+                results[i].errors = e.errors(include_url=False, include_context=False)
+                continue
+            if customer.channel not in self.feature_plan.channel_codes:
+                results[i].errors = [{
+                    "type": "value_error",
+                    "loc": ["channel"],
+                    "msg": f"Unknown channel '{customer.channel}', expected one of {self.feature_plan.channel_classes}"
+                }]
+                continue
+            valid_idx.append(i)
+            customers.append(customer)
+        
+        if customers:
+            try:
+                # float64 so rule thresholds see exactly the values the client sent
+                X = self.feature_plan.encode_matrix(customers, dtype=np.float64)
+                churn_probs = self.predict_proba_matrix(X)
+            except Exception as e:
+                raise RequestRejected(400, f"Prediction error: {str(e)}")
+            
+            # All rules for all rows as NumPy masks in one pass
+            actions = self.rules.recommend(self.feature_plan.columns(X), len(X), churn_probability=churn_probs)
+            for i, churn_prob, row_actions in zip(valid_idx, churn_probs.tolist(), actions):
+                results[i].churn_probability = churn_prob
+                results[i].risk_level = get_risk_level(churn_prob, self.risk_cutoffs)
+                results[i].actions = row_actions
+        
+        return BatchPredictionResponse(
+            n_records=len(records),
+            n_scored=len(customers),
+            n_failed=len(records) - len(customers),
+            results=results,
+            model_version=self.version
+        )
+
+def _worker_serving_model(*identity) -> ServingModel:
+    """The process worker's own ServingModel, checked against the expected identity"""
+    if serving is None or serving.identity != identity:
+        loaded = serving.identity if serving is not None else None
+        raise RuntimeError(f"Worker has model/rules/cutoffs {loaded}, expected {identity}")
+    return serving
+
+def _worker_version() -> tuple:
+    return serving.identity
+
+def _file_version(*paths) -> str:
+    """Content hash of the given files, for artifacts without a stored version"""
+    content = b""
+    for path in paths:
+        with open(path, 'rb') as f:
+            content += f.read()
+    return model_version_of(content)
+
+def build_serving_model() -> ServingModel:
+    """Load model, scaler, feature names and retention rules from disk into a new ServingModel"""
+    load_started_at = time.perf_counter()
+    rules = load_rules(RETENTION_RULES_PATH)
+    if os.path.exists(MODEL_BUNDLE_PATH):
+        # Header parse + mmap: arrays are shared page cache across workers
+        model_bundle = ModelBundle(MODEL_BUNDLE_PATH)
+        names = model_bundle.feature_names
+        if model_bundle.scaler_folded:
+            plan = FeaturePlan(names, model_bundle.channel_classes)
+        else:
+            mean, scale = model_bundle.scaler_params()
+            plan = FeaturePlan(names, model_bundle.channel_classes, mean=mean, scale=scale)
+        state = ServingModel(model_bundle.forest(backend=TREE_ENGINE_BACKEND), None, names, plan,
+                             "bundle", model_bundle.model_version, rules, bundle=model_bundle)
+    else:
+        if os.path.exists(UNSCALED_MODEL_PATH):
+            loaded_model = CompiledForest.from_file(UNSCALED_MODEL_PATH, backend=TREE_ENGINE_BACKEND)
+            loaded_scaler = None
+            source, version = "json", _file_version(UNSCALED_MODEL_PATH)
+        else:
+            # Pickles pull in joblib, sklearn and xgboost, so only import on this path
+            import joblib
+            loaded_model = joblib.load(MODEL_PATH)
+            loaded_scaler = joblib.load(SCALER_PATH)
+            if hasattr(loaded_model, 'get_booster'):
+                loaded_model = CompiledForest.from_booster(loaded_model, backend=TREE_ENGINE_BACKEND)
+            source, version = "pickle", _file_version(MODEL_PATH, SCALER_PATH)
+        
+        with open(FEATURE_NAMES_PATH, 'r') as f:
+            names = json.load(f)
+        
+        # Precompile feature assembly, channel encoding and scaling for the hot path
+        plan = FeaturePlan.from_scaler(names, loaded_scaler, CHANNEL_CLASSES)
+        state = ServingModel(loaded_model, loaded_scaler, names, plan, source, version, rules)
+    state.timings["artifact_load_seconds"] = time.perf_counter() - load_started_at
+    
+    # Warm up so JIT compilation doesn't land on the first request
+    warmup_started_at = time.perf_counter()
+    if isinstance(state.model, CompiledForest):
+        state.model.predict(np.zeros((1, len(state.feature_names)), dtype=np.float32))
+    state.timings["warmup_seconds"] = time.perf_counter() - warmup_started_at
+    
+    limit_model_threads(state.model, INFERENCE_NTHREAD)
+    return state
+
+def activate(state: ServingModel):
+    """Make `state` the version new requests are served with (a single rebind)"""
+    global serving, model, scaler, feature_names, feature_plan, bundle, artifact_source
+    serving = state
+    model, scaler, feature_names, feature_plan = state.model, state.scaler, state.feature_names, state.feature_plan
+    bundle, artifact_source = state.bundle, state.source
+
+def load_artifacts():
+    """Load model, scaler, and feature names"""
+    try:
+        state = build_serving_model()
+        activate(state)
+        startup_timings.update(state.timings)
+        print(f"✅ Model artifacts loaded successfully (version {state.version})")
+    except Exception as e:
+        print(f"❌ Error loading artifacts: {e}")
+        raise
+
+def limit_model_threads(loaded_model, nthread: int):
+    """Cap the threads a loaded model uses for a single predict call"""
+    if isinstance(loaded_model, CompiledForest):
+        # numpy/numba backends are single-threaded; only the reference booster spawns threads
+        if loaded_model._booster is not None:
+            loaded_model._booster.set_param({"nthread": nthread})
+    elif hasattr(loaded_model, 'get_booster'):
+        loaded_model.get_booster().set_param({"nthread": nthread})
+    elif hasattr(loaded_model, 'n_jobs'):
+        loaded_model.n_jobs = nthread
+
+def create_executor():
+    """Build the inference worker pool selected by INFERENCE_POOL"""
+    if INFERENCE_POOL == "none":
+        return None
+    if INFERENCE_POOL == "thread":
+        return ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+    if INFERENCE_POOL == "process":
+        # spawn: fresh interpreters, each loading its own copy of the model once
+        return ProcessPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=load_artifacts
+        )
+    raise ValueError(f"Unknown INFERENCE_POOL '{INFERENCE_POOL}', expected thread, process or none")
+
+async def start_process_workers(state: ServingModel):
+    """Give `state` its own process pool and wait until every worker has loaded it"""
+    state.executor = create_executor()
+    loop = asyncio.get_running_loop()
+    try:
+        versions = await asyncio.gather(*(loop.run_in_executor(state.executor, _worker_version)
+                                          for _ in range(INFERENCE_WORKERS)))
+        expected = state.identity
+        if any(version != expected for version in versions):
+            raise RuntimeError(f"Workers loaded versions {sorted(set(versions))}, expected {expected} "
+                               "(artifacts changed during reload)")
+    except Exception:
+        state.executor.shutdown(wait=False)
+        state.executor = None
+        raise
+
+async def run_inference(state: ServingModel, fn, *args):
+    """Run a CPU-bound call on the inference pool (inline when there is none)"""
+    pool = state.executor or executor
+    if pool is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+def validate_serving_model(state: ServingModel) -> dict:
+    """Score canary rows with a freshly loaded model before it goes live.
+
+    Bundles carry canary rows with the probabilities the trainer's own
+    booster produced; those must be reproduced to CANARY_ATOL. Every model
+    must also score a default customer through the single-row path.
+    """
+    report = {}
+    if state.bundle is not None:
+        X_canary, p_expected = state.bundle.canary()
+        if X_canary is not None:
+            p = state.predict_proba_matrix(X_canary)
+            max_diff = float(np.abs(p - p_expected).max())
+            report.update(canary_rows=len(X_canary), canary_max_abs_diff=max_diff)
+            if not max_diff <= CANARY_ATOL:
+                raise ValueError(f"Canary predictions differ by {max_diff:.2e} (> CANARY_ATOL={CANARY_ATOL:g})")
+            # How far the new model moves scores compared with the live one
+            if serving is not None and serving.feature_names == state.feature_names:
+                report["mean_abs_change_vs_live"] = float(np.abs(p - serving.predict_proba_matrix(X_canary)).mean())
+    
+    p_default = state.predict_customer(CANARY_CUSTOMER)
+    if not 0.0 <= p_default <= 1.0:
+        raise ValueError(f"Default customer scored {p_default}, outside [0, 1]")
+    report["default_customer_probability"] = p_default
+    return report
+
+async def reload_model() -> dict:
+    """Load, validate and swap in the artifacts on disk without dropping requests"""
+    async with reload_lock:
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        previous = serving
+        # Load and validate off the event loop; requests keep using `previous`
+        state = await loop.run_in_executor(None, build_serving_model)
+        # Same booster and rules with new risk bands in the bundle metadata is still a change
+        if previous is not None and state.identity == previous.identity:
+            return {"status": "unchanged", "model_version": previous.version, "rules_version": previous.rules.version}
+        report = await loop.run_in_executor(None, validate_serving_model, state)
+        if INFERENCE_POOL == "process":
+            await start_process_workers(state)
+        
+        activate(state)
+        if prediction_cache is not None:
+            await prediction_cache.clear()
+        # Already-submitted calls still finish on the old workers before they exit
+        if previous is not None and previous.executor is not None:
+            previous.executor.shutdown(wait=False)
+        return {
+            "status": "reloaded",
+            "previous_version": previous.version if previous is not None else None,
+            "model_version": state.version,
+            "rules_version": state.rules.version,
+            "risk_cutoffs": state.risk_cutoffs,
+            "source": state.source,
+            "reload_seconds": time.perf_counter() - started_at,
+            "canary": report
+        }
+
+def artifact_signature() -> tuple:
+    """(path, mtime, size) of every artifact file the loader may read"""
+    signature = []
+    for path in (MODEL_BUNDLE_PATH, UNSCALED_MODEL_PATH, MODEL_PATH, SCALER_PATH, FEATURE_NAMES_PATH,
+                 RETENTION_RULES_PATH):
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+async def watch_artifacts(interval: float):
+    """Reload when the artifact files change and then stay unchanged for one poll"""
+    last = artifact_signature()
+    pending = False
+    while True:
+        await asyncio.sleep(interval)
+        current = artifact_signature()
+        if current != last:
+            # Still being written (or just replaced): wait for it to settle
+            last, pending = current, True
+            continue
+        if not pending:
+            continue
+        pending = False
+        try:
+            result = await reload_model()
+            print(f"🔄 Model {result['status']}: version {result['model_version']}")
+        except Exception as e:
+            print(f"❌ Model reload failed, still serving {serving.version}: {e}")
+
+# Load artifacts on startup
+@app.on_event("startup")
+async def startup_event():
+    global batcher, executor, watcher, reload_lock, prediction_cache
+    load_artifacts()
+    reload_lock = asyncio.Lock()
+    if INFERENCE_POOL == "process":
+        await start_process_workers(serving)
+    else:
+        executor = create_executor()
+    startup_timings["startup_seconds"] = time.perf_counter() - IMPORT_STARTED_AT
+    
+    if PREDICT_BATCHING:
+        batcher = PredictionBatcher(
+            predict_customers_async,
+            max_batch_size=PREDICT_BATCH_MAX_SIZE,
+            max_wait_ms=PREDICT_BATCH_MAX_WAIT_MS,
+            # Keep every worker busy: one batch in flight per worker
+            max_in_flight=INFERENCE_WORKERS if INFERENCE_POOL != "none" else 1
+        )
+        batcher.start()
+    
+    prediction_cache = create_prediction_cache(
+        PREDICTION_CACHE,
+        max_bytes=PREDICTION_CACHE_MAX_MB * 1024 * 1024,
+        ttl_s=PREDICTION_CACHE_TTL_S,
+        redis_url=PREDICTION_CACHE_REDIS_URL
+    )
+    
+    if MODEL_WATCH_INTERVAL_S > 0:
+        watcher = asyncio.get_running_loop().create_task(watch_artifacts(MODEL_WATCH_INTERVAL_S))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global executor, watcher
+    if watcher is not None:
+        watcher.cancel()
+        watcher = None
+    if batcher is not None:
+        await batcher.stop()
+    if prediction_cache is not None:
+        await prediction_cache.close()
+    if executor is not None:
+        executor.shutdown(wait=True)
+        executor = None
+    if serving is not None and serving.executor is not None:
+        serving.executor.shutdown(wait=True)
+        serving.executor = None
+
+# Used to smoke-test every newly loaded model
+CANARY_CUSTOMER = CustomerData(
+    avg_order_value=50.0, total_purchases=5, email_open_rate=50.0, days_since_last_purchase=30,
+    loyalty_program=0, website_visits=15, return_rate=10.0, support_tickets=1, channel="web"
+)
+
+def get_risk_level(churn_prob: float, cutoffs: Optional[dict] = None) -> str:
+    """Map a churn probability to its risk band (the live model's cutoffs by default)"""
+    if cutoffs is None and serving is not None:
+        cutoffs = serving.risk_cutoffs
+    return risk_level(churn_prob, cutoffs)
+
+def build_feature_matrix(customers: List[CustomerData]) -> np.ndarray:
+    """Assemble customers into one contiguous float32 matrix in feature_names order"""
+    return serving.build_feature_matrix(customers)
+
+def predict_proba_scaled(X_scaled: np.ndarray) -> np.ndarray:
+    """Return churn probabilities for already-scaled rows"""
+    return serving.predict_proba_scaled(X_scaled)
+
+def predict_proba_matrix(X: np.ndarray) -> np.ndarray:
+    """Scale a raw feature matrix and return churn probabilities in row order"""
+    return serving.predict_proba_matrix(X)
+
+def predict_customers(customers: List[CustomerData]) -> list:
+    """Score validated customers with one vectorized model call"""
+    return serving.predict_proba_matrix(serving.build_feature_matrix(customers)).tolist()
+
+async def predict_customers_async(customers: List[CustomerData]) -> list:
+    """Encode in the event loop, score on the inference pool.
+
+    Returns (probability, model_version) pairs; the whole batch is scored
+    by the version that was live when it was dispatched.
+    """
+    state = serving
+    X = state.build_feature_matrix(customers)
+    churn_probs = await run_inference(state, state.predict_proba_matrix, X)
+    return [(churn_prob, state.version) for churn_prob in churn_probs.tolist()]
+
+def parse_batch_records(body: bytes, content_type: str) -> list:
+    """Decode a batch body (JSON array or NDJSON) into raw records.
+
+    NDJSON lines that fail to decode are returned as exceptions so they can be
+    reported inline with the other per-row errors.
+    """
+    if content_type.split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        records = []
+        for line in body.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                records.append(e)
+        return records
+    
+    try:
+        records = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise RequestRejected(400, f"Invalid JSON body: {e}")
+    if isinstance(records, dict) and "customers" in records:
+        records = records["customers"]
+    if not isinstance(records, list):
+        raise RequestRejected(400, "Expected a JSON array of customer records")
+    return records
 
 # Routes
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    state = serving
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
-        "scaler_loaded": scaler is not None
+        "model_loaded": state is not None,
+        "model_version": state.version if state is not None else None,
+        "model_loaded_at": state.loaded_at if state is not None else None,
+        "rules_version": state.rules.version if state is not None else None,
+        "scaler_loaded": state is not None and state.scaler is not None,
+        "scaler_folded": state is not None and state.scaler is None,
+        "tree_engine_backend": state.model.backend if state is not None and isinstance(state.model, CompiledForest) else None,
+        "artifact_source": state.source if state is not None else None,
+        # Training lineage recorded in the bundle (mode, round, parent version, samples seen)
+        "model_metadata": state.bundle.metadata if state is not None and state.bundle is not None else None,
+        "risk_cutoffs": state.risk_cutoffs if state is not None else None,
+        "startup": startup_timings,
+        "inference_pool": INFERENCE_POOL,
+        "inference_workers": INFERENCE_WORKERS if INFERENCE_POOL != "none" else 0,
+        "model_watch_interval_s": MODEL_WATCH_INTERVAL_S
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Micro-batcher histograms and prediction cache counters"""
+    return {
+        "batcher": batcher.stats() if batcher is not None else None,
+        "prediction_cache": prediction_cache.stats() if prediction_cache is not None else None
     }
 
+@app.post("/admin/reload")
+async def admin_reload(x_admin_token: Optional[str] = Header(default=None)):
+    """Load the artifacts on disk, validate them on canary rows and swap them in.
+
+    Requires ADMIN_TOKEN to be set and sent as the X-Admin-Token header. A
+    model that fails to load or validate is discarded and the live one kept.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Set ADMIN_TOKEN to enable admin endpoints")
+    if not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    try:
+        return await reload_model()
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Reload failed, still serving {serving.version}: {str(e)}")
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_churn_batch(request: Request):
+    """Predict churn for many customers in one vectorized model call.
+
+    Accepts a JSON array (or {"customers": [...]}) or NDJSON with one record
+    per line. Invalid records are reported inline and do not fail the batch.
+    Decoding, validation and scoring all run on the inference pool.
+    """
+    state = serving
+    if state is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    
+    try:
+        return await run_inference(state, state.score_batch, await request.body(),
+                                   request.headers.get("content-type", ""))
+    except RequestRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
 @app.post("/predict", response_model=PredictionResponse)
 async def predict_churn(customer: CustomerData):
     """Predict churn probability for a customer"""
     
-    if model is None or scaler is None or feature_names is None:
+    state = serving
+    if state is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
     
     try:
-        # Convert channel to encoded value
-        channel_encoded = label_encoder.transform([customer.channel])[0]
+        cache_key = None
+        if prediction_cache is not None:
+            # The encoded row holds every field the model and the strategies read
+            cache_key = make_cache_key(state.feature_plan.encode_row(customer), state.version, state.rules.version,
+                                       state.risk_cutoffs)
+            cached = await prediction_cache.get(cache_key)
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
         
-        # Create feature vector in the correct order
-        feature_dict = {
-            'customer_age': customer.customer_age,
-            'account_age_days': customer.account_age_days,
-            'total_purchases': customer.total_purchases,
-            'avg_order_value': customer.avg_order_value,
-            'days_since_last_purchase': customer.days_since_last_purchase,
-            'website_visits': customer.website_visits,
-            'email_open_rate': customer.email_open_rate,
-            'support_tickets': customer.support_tickets,
-            'product_categories_browsed': customer.product_categories_browsed,
-            'avg_session_duration_min': customer.avg_session_duration_min,
-            'loyalty_program': customer.loyalty_program,
-            'discount_usage': customer.discount_usage,
-            'review_count': customer.review_count,
-            'payment_failures': customer.payment_failures,
-            'return_rate': customer.return_rate,
-            'mobile_usage_pct': customer.mobile_usage_pct,
-            'channel_encoded': channel_encoded
-        }
-        
-        # Create DataFrame with features in correct order
-        customer_df = pd.DataFrame([feature_dict])
-        
-        # Ensure feature order matches training
-        customer_features = customer_df[feature_names]
-        
-        # Scale features
-        customer_scaled = scaler.transform(customer_features)
-        
-        # Predict
-        if hasattr(model, 'predict_proba'):
-            churn_prob = model.predict_proba(customer_scaled)[0, 1]
+        if batcher is not None:
+            # Reject bad input here so it can't fail the other requests in its batch
+            state.feature_plan.encode_channel(customer.channel)
+            churn_prob, model_version = await batcher.submit(customer)
         else:
-            # Neural network
-            churn_prob = float(model.predict(customer_scaled, verbose=0)[0][0])
+            churn_prob = await run_inference(state, state.predict_customer, customer)
+            model_version = state.version
         
         # Determine risk level
-        if churn_prob > 0.7:
-            risk_level = "HIGH"
-        elif churn_prob > 0.4:
-            risk_level = "MEDIUM"
-        else:
-            risk_level = "LOW"
+        risk_level = get_risk_level(churn_prob, state.risk_cutoffs)
         
         # Generate retention strategies
-        actions = generate_retention_strategies(customer, churn_prob)
+        actions = state.rules.recommend_one(customer, churn_prob)
         
-        return PredictionResponse(
+        response = PredictionResponse(
             churn_probability=float(churn_prob),
             risk_level=risk_level,
-            actions=actions
+            actions=actions,
+            model_version=model_version
         )
+        # Serialize once; cache hits then return these exact bytes
+        content = response.model_dump_json().encode("utf-8")
+        if cache_key is not None and model_version == state.version:
+            await prediction_cache.set(cache_key, content)
+        return Response(content=content, media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Prediction error: {str(e)}")
 
 def generate_retention_strategies(customer: CustomerData, churn_prob: float) -> list:
     """Generate personalized retention strategies for Haryana businesses"""
-    actions = []
-    
-    # High-value customer strategies (for Haryana MSMEs and retailers)
-    if customer.avg_order_value > 100:
-        actions.append({
-            "priority": "HIGH",
-            "action": "VIP Customer Care - Haryana Business Focus",
-            "details": "Assign dedicated relationship manager familiar with local Haryana market. Offer priority support and exclusive deals on regional products. Consider partnership with local Haryana suppliers for better pricing."
-        })
-    
-    # Engagement strategies with Haryana context
-    if customer.days_since_last_purchase > 60:
-        actions.append({
-            "priority": "HIGH",
-            "action": "Win-back Campaign - Regional Focus",
-            "details": "Send personalized WhatsApp/email in Hindi/Haryanvi with 20% discount. Highlight local Haryana products (basmati rice, dairy, textiles). Offer free delivery within Haryana districts. Partner with local festivals/events (Teej, Diwali, Baisakhi)."
-        })
-    
-    if customer.email_open_rate < 30:
-        actions.append({
-            "priority": "MEDIUM",
-            "action": "Re-engagement Program - Local Channels",
-            "details": "Switch to WhatsApp Business for better engagement in Haryana. Send bilingual (Hindi-English) content. Use local Haryana influencers or community leaders. Time messages according to local business hours (avoid harvest seasons for farmers)."
-        })
-    
-    # Loyalty strategies with Haryana context
-    if customer.loyalty_program == 0:
-        actions.append({
-            "priority": "MEDIUM",
-            "action": "Haryana Loyalty Program Enrollment",
-            "details": "Offer bonus points redeemable at local Haryana partner stores. Provide discounts on regional products. Include benefits like free home delivery in Gurgaon, Faridabad, Panipat, etc. Partner with Haryana Tourism for exclusive offers."
-        })
-    
-    # Product and service improvements for Haryana market
-    if customer.return_rate > 15:
-        actions.append({
-            "priority": "HIGH",
-            "action": "Quality Assurance - Local Standards",
-            "details": "Investigate returns - ensure products meet Haryana quality standards. Offer product consultation in local language. Provide easy return pickup from major Haryana cities. Partner with local quality certification bodies."
-        })
-    
-    if customer.support_tickets > 3:
-        actions.append({
-            "priority": "HIGH",
-            "action": "Proactive Support - Regional Service",
-            "details": "Schedule follow-up call with Hindi/Haryanvi speaking support staff. Offer on-site service in major Haryana cities (Gurgaon, Faridabad, Panchkula). Partner with local service centers. Provide WhatsApp support for faster resolution."
-        })
-    
-    # Haryana-specific strategies based on channel
-    if customer.channel == "mobile" and customer.mobile_usage_pct > 70:
-        actions.append({
-            "priority": "MEDIUM",
-            "action": "Mobile-First Engagement",
-            "details": "Optimize for mobile users (high in Haryana). Launch mobile app with regional language support. Offer mobile-exclusive deals. Partner with local mobile payment providers (Paytm, PhonePe popular in Haryana)."
-        })
-    
-    # Agriculture/Seasonal considerations for Haryana
-    if customer.avg_order_value < 50 and customer.total_purchases < 3:
-        actions.append({
-            "priority": "MEDIUM",
-            "action": "Seasonal Engagement Strategy",
-            "details": "Time campaigns around Haryana's agricultural calendar. Offer seasonal products (winter clothing, monsoon essentials). Consider local festivals and harvest seasons. Partner with Haryana's MSME sector for bundled offers."
-        })
-    
-    # Default action with Haryana context
-    if not actions:
-        actions.append({
-            "priority": "LOW",
-            "action": "Standard Haryana Business Engagement",
-            "details": "Continue standard engagement with focus on local Haryana market preferences. Maintain bilingual communication. Support local Haryana businesses and suppliers. Stay aligned with regional business practices."
-        })
-    
-    return actions
+    return serving.rules.recommend_one(customer, churn_prob)
 
 if __name__ == "__main__":
     import uvicorn
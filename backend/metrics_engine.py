@@ -0,0 +1,93 @@
+"""
+Binary classification metrics from a single sort of the scores
+"""
+import numpy as np
+
+
+class ScoreCurve:
+    """Confusion counts of a scored test set at every distinct threshold.
+
+    The scores are sorted once (descending); cumulative label counts at the
+    end of each run of tied scores give the true and false positives when
+    everything scoring at or above that value is called positive. Threshold
+    metrics, the ROC and precision-recall curves and their areas are all
+    read off these arrays, matching sklearn.metrics on the same inputs.
+    """
+
+    def __init__(self, y_true, y_score):
+        y_true = np.asarray(y_true).ravel().astype(bool)
+        y_score = np.asarray(y_score).ravel()
+        if len(y_true) != len(y_score):
+            raise ValueError(f"y_true has {len(y_true)} rows but y_score has {len(y_score)}")
+
+        order = np.argsort(y_score, kind='stable')[::-1]
+        sorted_score = y_score[order]
+        # Last row of every run of equal scores
+        ends = np.flatnonzero(np.r_[sorted_score[1:] != sorted_score[:-1], True]) if len(order) else order
+        self.thresholds = sorted_score[ends]
+        self.tp = np.cumsum(y_true[order], dtype=np.int64)[ends]
+        self.fp = (ends + 1) - self.tp
+        self.n_pos = int(self.tp[-1]) if len(ends) else 0
+        self.n_neg = len(y_true) - self.n_pos
+
+    def __len__(self):
+        return self.n_pos + self.n_neg
+
+    def confusion_at(self, threshold=0.5):
+        """(tn, fp, fn, tp) when scores strictly above threshold are called positive"""
+        # thresholds are descending, so the ones above `threshold` form a prefix
+        k = int(np.searchsorted(-self.thresholds, -threshold, side='left'))
+        tp = int(self.tp[k - 1]) if k else 0
+        fp = int(self.fp[k - 1]) if k else 0
+        return self.n_neg - fp, fp, self.n_pos - tp, tp
+
+    def metrics_at(self, threshold=0.5):
+        """accuracy, precision, recall, f1 and the 2x2 confusion matrix at one threshold.
+
+        Undefined ratios are 0, as sklearn's zero_division default reports them.
+        """
+        tn, fp, fn, tp = self.confusion_at(threshold)
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        return {
+            'accuracy': (tp + tn) / len(self) if len(self) else 0.0,
+            'precision': precision,
+            'recall': recall,
+            'f1_score': 2 * tp / (2 * tp + fp + fn) if tp else 0.0,
+            'confusion_matrix': np.array([[tn, fp], [fn, tp]])
+        }
+
+    def roc_curve(self, drop_intermediate=False):
+        """(fpr, tpr, thresholds) at every distinct score, starting from (0, 0) like sklearn's.
+
+        drop_intermediate keeps only the corners of the curve (sklearn's
+        default), which is all a plot needs.
+        """
+        fp, tp, thresholds = self.fp, self.tp, self.thresholds
+        if drop_intermediate and len(fp) > 2:
+            keep = np.r_[True, np.logical_or(np.diff(fp, 2), np.diff(tp, 2)), True]
+            fp, tp, thresholds = fp[keep], tp[keep], thresholds[keep]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fpr = np.r_[0, fp] / self.n_neg
+            tpr = np.r_[0, tp] / self.n_pos
+        return fpr, tpr, np.r_[np.inf, thresholds]
+
+    def roc_auc(self):
+        """Area under the ROC curve (ties count half); nan when only one class is present"""
+        if not (self.n_pos and self.n_neg):
+            return float('nan')
+        fpr, tpr, _ = self.roc_curve()
+        # Trapezoid rule written out: np.trapezoid needs numpy >= 2
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def pr_curve(self):
+        """(precision, recall, thresholds) in increasing-threshold order, ending at (1, 0) like sklearn's"""
+        precision = self.tp / (self.tp + self.fp)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            recall = self.tp / self.n_pos if self.n_pos else np.ones_like(precision)
+        return np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0], self.thresholds[::-1]
+
+    def average_precision(self):
+        """Step-wise area under the precision-recall curve (sklearn's average_precision_score)"""
+        precision, recall, _ = self.pr_curve()
+        return float(-np.sum(np.diff(recall) * precision[:-1]))
@@ -0,0 +1,190 @@
+"""
+Single-file, memory-mapped model bundle for fast server startup
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+import numpy as np
+
+from tree_engine import CompiledForest
+
+# File layout:
+#   magic (8 bytes) | header length (uint64 LE) | JSON header | padding |
+#   64-byte aligned sections: raw C-order arrays, then opaque blobs
+# The header records each section's offset/dtype/shape, so workers map the
+# file once and view the arrays in place; every process shares the same pages.
+MAGIC = b"CHURNMB\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+FOREST_ARRAYS = ('feature', 'threshold', 'default_right', 'leaf_value')
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def model_version_of(booster_raw):
+    """Content hash of the serialized booster, used as the model version"""
+    return hashlib.blake2b(bytes(booster_raw), digest_size=6).hexdigest()
+
+
+def write_bundle(path, forest, feature_names, channel_classes, scaler=None,
+                 booster_raw=None, scaler_folded=True, metadata=None, canary=None):
+    """Write a bundle holding the compiled forest, scaler params and booster.
+
+    `booster_raw` is the booster in xgboost's native UBJ (or JSON) format,
+    kept for the reference backend and retraining. `scaler_folded` says the
+    forest takes raw rows; the scaler statistics are stored either way.
+    `canary` is an optional (X_raw, probabilities) pair scored by the
+    trainer, which the server replays before putting the bundle live.
+    The file is written next to `path` and renamed into place, so readers
+    never see a partial bundle.
+    """
+    arrays = {name: np.ascontiguousarray(getattr(forest, name)) for name in FOREST_ARRAYS}
+    if scaler is not None:
+        arrays['scaler_mean'] = np.asarray(scaler.mean_, dtype=np.float64)
+        arrays['scaler_scale'] = np.asarray(scaler.scale_, dtype=np.float64)
+        if getattr(scaler, 'var_', None) is not None:
+            arrays['scaler_var'] = np.asarray(scaler.var_, dtype=np.float64)
+        arrays['scaler_n_samples_seen'] = np.atleast_1d(np.asarray(scaler.n_samples_seen_, dtype=np.int64))
+    if canary is not None:
+        arrays['canary_X'] = np.ascontiguousarray(canary[0], dtype=np.float32)
+        arrays['canary_p'] = np.ascontiguousarray(canary[1], dtype=np.float64)
+    blobs = {'booster': bytes(booster_raw)} if booster_raw is not None else {}
+
+    metadata = dict(metadata or {})
+    if booster_raw is not None:
+        metadata.setdefault('model_version', model_version_of(booster_raw))
+
+    sections = []
+    header = {
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'feature_names': list(feature_names),
+        'channel_classes': list(channel_classes),
+        'scaler_folded': bool(scaler_folded),
+        'forest': {
+            'base_margin': float(forest.base_margin),
+            'n_features': forest.n_features,
+            'n_trees': forest.n_trees,
+            'max_depth': forest.max_depth
+        },
+        'metadata': metadata,
+        'arrays': {},
+        'blobs': {}
+    }
+
+    # Offsets are relative to the data start, which depends on the header size
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        sections.append((offset, array.tobytes()))
+        offset = _align(offset + array.nbytes)
+    for name, blob in blobs.items():
+        header['blobs'][name] = {'offset': offset, 'length': len(blob)}
+        sections.append((offset, blob))
+        offset = _align(offset + len(blob))
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for section_offset, data in sections:
+            f.seek(data_start + section_offset)
+            f.write(data)
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    return header
+
+
+class ModelBundle:
+    """Read-only, memory-mapped view of a bundle written by write_bundle.
+
+    Arrays are zero-copy views into one shared mapping, so opening a bundle
+    costs a header parse regardless of model size. The mapping stays open
+    for as long as the bundle or any array taken from it is alive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+        (header_len,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start:header_start + header_len])
+        if self.header['format_version'] > FORMAT_VERSION:
+            raise ValueError(f"Bundle format {self.header['format_version']} is newer than "
+                             f"supported version {FORMAT_VERSION}")
+        self._data_start = _align(header_start + header_len)
+
+    @property
+    def feature_names(self):
+        return self.header['feature_names']
+
+    @property
+    def channel_classes(self):
+        return self.header['channel_classes']
+
+    @property
+    def metadata(self):
+        return self.header['metadata']
+
+    @property
+    def model_version(self):
+        return self.metadata.get('model_version')
+
+    @property
+    def scaler_folded(self):
+        return self.header['scaler_folded']
+
+    def has_array(self, name):
+        return name in self.header['arrays']
+
+    def array(self, name):
+        """Read-only array view backed by the mapping"""
+        spec = self.header['arrays'][name]
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        return np.frombuffer(self._mmap, dtype=dtype, count=count,
+                             offset=self._data_start + spec['offset']).reshape(spec['shape'])
+
+    def blob(self, name):
+        """Raw bytes of a blob section, or None when the bundle has none"""
+        spec = self.header['blobs'].get(name)
+        if spec is None:
+            return None
+        start = self._data_start + spec['offset']
+        return self._mmap[start:start + spec['length']]
+
+    def scaler_params(self):
+        """(mean, scale) of the training scaler, or (None, None)"""
+        if not self.has_array('scaler_mean'):
+            return None, None
+        return self.array('scaler_mean'), self.array('scaler_scale')
+
+    def canary(self):
+        """(X_raw, expected probabilities) recorded at export, or (None, None)"""
+        if not self.has_array('canary_X'):
+            return None, None
+        return self.array('canary_X'), self.array('canary_p')
+
+    def forest(self, backend=None):
+        """CompiledForest over the mapped arrays"""
+        spec = self.header['forest']
+        return CompiledForest(
+            *(self.array(name) for name in FOREST_ARRAYS),
+            base_margin=spec['base_margin'], n_features=spec['n_features'], backend=backend,
+            # Only read (and parsed by xgboost) if the reference backend is selected
+            model_raw=lambda: self.blob('booster')
+        )
@@ -0,0 +1,152 @@
+"""
+Export helpers that turn training artifacts into serving artifacts
+"""
+import json
+import numpy as np
+import xgboost as xgb
+
+
+def _booster_json(booster):
+    """Return the booster's native JSON model as a dict"""
+    return json.loads(booster.save_raw(raw_format='json'))
+
+
+def _load_classifier(model_json):
+    """Build an XGBClassifier from a native JSON model dict"""
+    clf = xgb.XGBClassifier()
+    clf.load_model(bytearray(json.dumps(model_json).encode('utf-8')))
+    return clf
+
+
+def _snap_thresholds(candidates, thresholds, features, to_tree_space):
+    """Move float32 candidates to the exact boundary x < T <=> to_tree_space(x) < t.
+
+    to_tree_space is monotone, so the set of float32 inputs sent left is a
+    half-line; walking a few ulps from the analytic candidate finds its end.
+    """
+    c = candidates.astype(np.float32)
+    for _ in range(64):
+        lower = np.nextafter(c, np.float32(-np.inf))
+        move_down = to_tree_space(lower, features) >= thresholds
+        move_up = to_tree_space(c, features) < thresholds
+        if not (move_down.any() or move_up.any()):
+            break
+        c = np.where(move_down, lower, np.where(move_up, np.nextafter(c, np.float32(np.inf)), c))
+    return c
+
+
+def remap_split_thresholds(model_json, coef, offset, to_tree_space=None):
+    """Rewrite every split threshold t on feature f as t * coef[f] + offset[f].
+
+    Valid for any strictly increasing per-feature affine map, so the tree
+    decisions are unchanged when the inputs are mapped the same way. Leaves
+    (whose split_conditions slot holds the leaf value) are left untouched.
+
+    xgboost compares float32 values, so when to_tree_space(x, features)
+    reproduces how new-space inputs used to reach the trees, each threshold
+    is snapped to the float32 boundary that makes decisions match exactly.
+    """
+    coef = np.asarray(coef, dtype=np.float64)
+    offset = np.asarray(offset, dtype=np.float64)
+    if np.any(coef <= 0):
+        raise ValueError("Threshold remapping needs strictly positive coefficients")
+
+    for tree in model_json['learner']['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'])
+        features = np.asarray(tree['split_indices'])
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        split = left != -1
+        if np.any(np.asarray(tree['split_type'])[split] != 0):
+            raise ValueError("Categorical splits cannot be remapped")
+
+        f = features[split]
+        t = conditions[split]
+        remapped = t.astype(np.float64) * coef[f] + offset[f]
+        if to_tree_space is not None:
+            remapped = _snap_thresholds(remapped, t, f, to_tree_space)
+        conditions[split] = remapped
+        tree['split_conditions'] = conditions.tolist()
+
+    return model_json
+
+
+def fold_scaler_into_xgboost(xgb_model, scaler):
+    """Return a copy of an XGBClassifier trained on scaled data that takes raw rows.
+
+    StandardScaler maps x -> (x - mean) / scale, so a split x_scaled < t is the
+    same decision as x_raw < t * scale + mean.
+    """
+    n_features = len(scaler.scale_)
+    mean = np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(n_features), dtype=np.float64)
+    scale = np.asarray(scaler.scale_ if scaler.with_std else np.ones(n_features), dtype=np.float64)
+
+    def to_tree_space(x, features):
+        # Same arithmetic as StandardScaler.transform followed by xgboost's float32 cast
+        return ((x.astype(np.float64) - mean[features]) / scale[features]).astype(np.float32)
+
+    model_json = _booster_json(xgb_model.get_booster())
+    return _load_classifier(remap_split_thresholds(model_json, scale, mean, to_tree_space))
+
+
+def unfold_scaler_from_xgboost(xgb_model, scaler):
+    """Return an XGBClassifier copy of a raw-input model (classifier or Booster) that takes scaler output.
+
+    The inverse of fold_scaler_into_xgboost. xgboost sends a raw value left
+    when float32(x_raw) < T, i.e. when x_raw is below the midpoint B of T and
+    the float32 before it. The split becomes x_scaled < (B - mean) / scale,
+    computed with StandardScaler.transform's own arithmetic, so raw values
+    keep their side of the split whether or not they are float32-exact.
+    Rounded to float32, that threshold can land on the scaled value of the
+    float32 below T; it is then clamped into (scaled(prev T), scaled(T)],
+    so every float32 raw value keeps its side and folding the result with
+    the same scaler gives back T exactly. The one exception is when both
+    values scale to the same float32: no scaled split can tell them apart,
+    and the refolded split follows the scaled model.
+    """
+    n_features = len(scaler.scale_)
+    mean = np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(n_features), dtype=np.float64)
+    scale = np.asarray(scaler.scale_ if scaler.with_std else np.ones(n_features), dtype=np.float64)
+
+    booster = xgb_model.get_booster() if hasattr(xgb_model, 'get_booster') else xgb_model
+    model_json = _booster_json(booster)
+    for tree in model_json['learner']['gradient_booster']['model']['trees']:
+        split = np.asarray(tree['left_children']) != -1
+        if np.any(np.asarray(tree['split_type'])[split] != 0):
+            raise ValueError("Categorical splits cannot be remapped")
+        f = np.asarray(tree['split_indices'])[split]
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        t = conditions[split]
+        below = np.nextafter(t, np.float32(-np.inf))
+        boundary = (below.astype(np.float64) + t.astype(np.float64)) / 2
+        scaled = ((boundary - mean[f]) / scale[f]).astype(np.float32)
+        # The float32 thresholds in the scaled space that split below from t
+        lowest = np.nextafter(((below.astype(np.float64) - mean[f]) / scale[f]).astype(np.float32),
+                              np.float32(np.inf))
+        highest = ((t.astype(np.float64) - mean[f]) / scale[f]).astype(np.float32)
+        conditions[split] = np.minimum(np.maximum(scaled, lowest), highest)
+        tree['split_conditions'] = conditions.tolist()
+    return _load_classifier(model_json)
+
+
+def verify_folded_model(folded_model, xgb_model, scaler, X_raw, atol=1e-4):
+    """Check the folded model against the scaler + model pipeline on raw rows.
+
+    The rows are rounded to float32 first, which is what the folded model
+    reads. A float64 value can round to either side of a split in raw space
+    and in scaled space, so unrounded rows would compare two rounding orders
+    rather than the two models. Returns (max_abs_diff, mismatch_rate) and
+    raises ValueError if any prediction differs by more than atol.
+    """
+    X_raw = np.asarray(X_raw, dtype=np.float32).astype(np.float64)
+    expected = xgb_model.predict_proba(scaler.transform(X_raw))[:, 1]
+    actual = folded_model.predict_proba(X_raw)[:, 1]
+
+    diff = np.abs(expected - actual)
+    max_diff = float(diff.max()) if len(diff) else 0.0
+    mismatch_rate = float((diff > atol).mean()) if len(diff) else 0.0
+    if max_diff > atol:
+        raise ValueError(
+            f"Folded model deviates from scaler+model pipeline: max |diff|={max_diff:.2e} "
+            f"on {mismatch_rate:.2%} of {len(diff)} rows (tolerance {atol:.0e})"
+        )
+    return max_diff, mismatch_rate
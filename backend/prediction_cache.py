@@ -0,0 +1,170 @@
+"""
+Prediction result cache keyed by the encoded feature row and model version
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # optional: only needed for the shared "redis" cache
+    redis_asyncio = None
+
+CACHE_BACKENDS = ('memory', 'redis', 'none')
+# Rough per-entry bookkeeping cost (dict slot, key bytes, tuple) on top of the value
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def make_cache_key(row, *versions):
+    """Hash a raw feature row together with the versions that shape the response.
+
+    The row is canonicalized to float64 with -0.0 folded into 0.0, so equal
+    feature values always give the same key however the client typed them.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(row.astype('<f8') + 0.0)
+    for version in versions:
+        digest.update(b'\x00' + str(version).encode('utf-8'))
+    return digest.digest()
+
+
+class PredictionCache:
+    """In-process LRU cache with a TTL, bounded by the bytes it holds.
+
+    Values are the serialized responses (bytes), so their size is known
+    exactly. Only touched from the event loop, which is why there is no lock.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl_s=3600.0):
+        self.max_bytes = int(max_bytes)
+        self.ttl = float(ttl_s)
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key, value):
+        size = len(value) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self.n_bytes += size
+        while self.n_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def clear(self):
+        self._entries.clear()
+        self.n_bytes = 0
+
+    async def close(self):
+        pass
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self.n_bytes -= len(value) + ENTRY_OVERHEAD_BYTES
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self.n_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class RedisPredictionCache:
+    """Shared cache so every uvicorn worker (and host) benefits from each hit.
+
+    Redis enforces the TTL and, with a maxmemory LRU policy, the memory
+    bound. Keys already include the model version, so entries from an old
+    model are never read again and simply expire.
+    """
+
+    def __init__(self, url, ttl_s=3600.0, prefix="churn:predict:"):
+        if redis_asyncio is None:
+            raise ImportError("The 'redis' prediction cache requires the redis package to be installed")
+        self.client = redis_asyncio.from_url(url)
+        self.ttl = float(ttl_s)
+        self.prefix = prefix.encode('utf-8')
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key):
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception:
+            # A cache outage must not fail predictions
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key, value):
+        try:
+            await self.client.set(self.prefix + key, value, px=int(self.ttl * 1000))
+        except Exception:
+            self.errors += 1
+
+    async def clear(self):
+        # Versioned keys make old entries unreachable; nothing to delete
+        pass
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "errors": self.errors
+        }
+
+
+def create_prediction_cache(backend, max_bytes, ttl_s, redis_url=None):
+    """Build the cache selected by PREDICTION_CACHE (None when disabled)"""
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return PredictionCache(max_bytes=max_bytes, ttl_s=ttl_s)
+    if backend == 'redis':
+        return RedisPredictionCache(redis_url or "redis://localhost:6379/0", ttl_s=ttl_s)
+    raise ValueError(f"Unknown prediction cache '{backend}', expected one of {CACHE_BACKENDS}")
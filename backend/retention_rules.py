@@ -0,0 +1,166 @@
+"""
+Declarative retention-strategy rules evaluated as NumPy masks
+"""
+import hashlib
+import json
+import operator
+import os
+import numpy as np
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+# Haryana-focused rules served by the API, and the generic set used by churn_prediction_system.py
+HARYANA_RULES_PATH = os.path.join(RULES_DIR, "haryana.json")
+GENERIC_RULES_PATH = os.path.join(RULES_DIR, "generic.json")
+
+# op -> (vectorized, scalar)
+OPERATORS = {
+    '>': (np.greater, operator.gt),
+    '>=': (np.greater_equal, operator.ge),
+    '<': (np.less, operator.lt),
+    '<=': (np.less_equal, operator.le),
+    '==': (np.equal, operator.eq),
+    '!=': (np.not_equal, operator.ne),
+    'in': (np.isin, lambda x, values: x in values),
+    'not in': (lambda x, values: ~np.isin(x, values), lambda x, values: x not in values)
+}
+# Pseudo-feature available to every rule
+CHURN_PROBABILITY = 'churn_probability'
+
+
+class Condition:
+    """One `feature op value` test"""
+
+    def __init__(self, feature, op, value):
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}', expected one of {list(OPERATORS)}")
+        self.feature = feature
+        self.op = op
+        self.value = value
+        self._vectorized, self._scalar = OPERATORS[op]
+
+    def mask(self, column):
+        return self._vectorized(column, self.value)
+
+    def test(self, value):
+        return self._scalar(value, self.value)
+
+
+class RuleTable:
+    """Ordered retention rules: every rule whose conditions all hold adds its action.
+
+    Loaded from JSON:
+
+        {"rules": [{"when": [{"feature": "support_tickets", "op": ">", "value": 3}],
+                    "priority": "HIGH", "action": "...", "details": "..."}, ...],
+         "default": {"priority": "LOW", "action": "...", "details": "..."}}
+
+    A single-condition rule may give feature/op/value at the top level
+    instead of `when`. `default` (optional) is used when no rule matches.
+    A condition on a feature the input doesn't have is false.
+    """
+
+    def __init__(self, rules, default=None, name=None, version=None):
+        self.name = name
+        self.rules = []
+        for rule in rules:
+            when = rule.get('when') or [{k: rule[k] for k in ('feature', 'op', 'value')}]
+            conditions = [Condition(c['feature'], c['op'], c['value']) for c in when]
+            action = {k: rule[k] for k in ('priority', 'action', 'details')}
+            self.rules.append((conditions, action))
+        self.default = dict(default) if default else None
+        self.features = sorted({c.feature for conditions, _ in self.rules for c in conditions})
+        self.version = version
+
+    @classmethod
+    def from_dict(cls, spec, version=None):
+        return cls(spec['rules'], spec.get('default'), name=spec.get('name'), version=version)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a JSON rule file; its content hash becomes the table version"""
+        with open(path, 'rb') as f:
+            content = f.read()
+        version = hashlib.blake2b(content, digest_size=6).hexdigest()
+        return cls.from_dict(json.loads(content), version=version)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def match(self, columns, n_rows):
+        """Boolean (n_rows, n_rules) matrix of which rules fire for which rows.
+
+        `columns` maps feature names to length-n_rows arrays (a DataFrame or
+        dict both work); each condition is one vectorized comparison.
+        """
+        matches = np.ones((n_rows, len(self.rules)), dtype=bool)
+        cache = {}
+        for j, (conditions, _) in enumerate(self.rules):
+            for condition in conditions:
+                if condition.feature not in columns:
+                    matches[:, j] = False
+                    break
+                key = (condition.feature, condition.op, json.dumps(condition.value))
+                if key not in cache:
+                    cache[key] = condition.mask(np.asarray(columns[condition.feature]))
+                matches[:, j] &= cache[key]
+        return matches
+
+    def recommend(self, columns, n_rows=None, churn_probability=None):
+        """Action lists for every row of a batch, in one pass.
+
+        Rows with the same set of matching rules share one list object, so
+        a million rows build only as many lists as there are distinct
+        patterns. Treat the returned lists as read-only.
+        """
+        action_lists, pattern = self.recommend_patterns(columns, n_rows, churn_probability)
+        return [action_lists[i] for i in pattern.tolist()]
+
+    def recommend_patterns(self, columns, n_rows=None, churn_probability=None):
+        """(distinct action lists, per-row index into them) for a batch.
+
+        The compact form of recommend(): callers that serialize actions
+        can encode each distinct list once and gather by the index array.
+        """
+        if churn_probability is not None:
+            columns = {name: columns[name] for name in columns.keys()}
+            columns[CHURN_PROBABILITY] = np.asarray(churn_probability)
+        if n_rows is None:
+            n_rows = len(columns.index) if hasattr(columns, 'index') else len(next(iter(columns.values())))
+        matches = self.match(columns, n_rows)
+
+        # One integer code per row identifies its set of matching rules
+        if len(self.rules) < 63:
+            codes = matches.astype(np.int64) @ (np.int64(1) << np.arange(len(self.rules), dtype=np.int64))
+            _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+            pattern_rows = matches[first]
+        else:
+            pattern_rows, inverse = np.unique(matches, axis=0, return_inverse=True)
+        return [self._actions(row) for row in pattern_rows], inverse.reshape(-1)
+
+    def recommend_one(self, record, churn_probability=None):
+        """Action list for a single record (attribute access, e.g. a pydantic model)"""
+        actions = []
+        for conditions, action in self.rules:
+            for condition in conditions:
+                if condition.feature == CHURN_PROBABILITY and churn_probability is not None:
+                    value = churn_probability
+                else:
+                    value = getattr(record, condition.feature, None)
+                if value is None or not condition.test(value):
+                    break
+            else:
+                actions.append(dict(action))
+        if not actions and self.default:
+            actions.append(dict(self.default))
+        return actions
+
+    def _actions(self, matched):
+        actions = [dict(action) for (_, action), hit in zip(self.rules, matched) if hit]
+        if not actions and self.default:
+            actions.append(dict(self.default))
+        return actions
+
+
+def load_rules(path=None, default_path=HARYANA_RULES_PATH):
+    """Load the rule table at `path`, falling back to `default_path`"""
+    return RuleTable.from_file(path or default_path)
@@ -0,0 +1,159 @@
+"""
+Risk-band cutoffs chosen for campaign value from one sorted pass over scored customers
+"""
+import json
+import numpy as np
+
+from metrics_engine import ScoreCurve
+
+# Bands used when a bundle carries no optimized cutoffs
+DEFAULT_RISK_CUTOFFS = {'high': 0.7, 'medium': 0.4}
+
+# Retained value is what a saved churner is worth; retention_rate is the share
+# of contacted churners an action keeps. Capacity is the most customers the
+# campaign can contact, as a fraction of those scored. These are example
+# economics: a campaign file overrides them field by field, and without a
+# file the bands stay at DEFAULT_RISK_CUTOFFS.
+DEFAULT_CAMPAIGN = {
+    'customer_value': 400.0,
+    'contact_capacity': 0.3,
+    'actions': {
+        'HIGH': {'cost': 40.0, 'retention_rate': 0.35},
+        'MEDIUM': {'cost': 4.0, 'retention_rate': 0.10}
+    }
+}
+
+
+def load_campaign(path=None, contact_capacity=None):
+    """Campaign costs from a JSON file shaped like DEFAULT_CAMPAIGN, or None without a file.
+
+    None keeps the fixed DEFAULT_RISK_CUTOFFS: the bands are only optimized
+    for economics the user supplied. contact_capacity overrides the file's.
+    """
+    if not path:
+        if contact_capacity is not None:
+            raise ValueError("contact_capacity overrides a campaign file's capacity; pass the campaign file too")
+        return None
+    campaign = json.loads(json.dumps(DEFAULT_CAMPAIGN))
+    with open(path, 'r') as f:
+        spec = json.load(f)
+    for band, action in spec.pop('actions', {}).items():
+        campaign['actions'][band.upper()].update(action)
+    campaign.update(spec)
+    if contact_capacity is not None:
+        campaign['contact_capacity'] = contact_capacity
+    if not 0 <= campaign['contact_capacity'] <= 1:
+        raise ValueError(f"contact_capacity must be a fraction in [0, 1], got {campaign['contact_capacity']}")
+    return campaign
+
+
+def risk_cutoffs_of(metadata):
+    """{'high', 'medium'} cutoffs recorded in bundle metadata, else DEFAULT_RISK_CUTOFFS"""
+    bands = (metadata or {}).get('risk_bands') or {}
+    return {band: float(bands.get(band, default)) for band, default in DEFAULT_RISK_CUTOFFS.items()}
+
+
+def risk_level(churn_prob, cutoffs=None):
+    """HIGH above the high cutoff, MEDIUM above the medium one, else LOW"""
+    cutoffs = cutoffs or DEFAULT_RISK_CUTOFFS
+    if churn_prob > cutoffs['high']:
+        return "HIGH"
+    elif churn_prob > cutoffs['medium']:
+        return "MEDIUM"
+    return "LOW"
+
+
+def risk_levels(churn_probs, cutoffs=None):
+    """Vectorized risk_level"""
+    cutoffs = cutoffs or DEFAULT_RISK_CUTOFFS
+    churn_probs = np.asarray(churn_probs)
+    return np.select([churn_probs > cutoffs['high'], churn_probs > cutoffs['medium']],
+                     ["HIGH", "MEDIUM"], default="LOW").astype(object)
+
+
+def _cutoff(thresholds, k):
+    """A cutoff that puts exactly the first k distinct scores (descending) above it"""
+    if k == 0:
+        return max(1.0, float(thresholds[0])) if len(thresholds) else 1.0
+    if k == len(thresholds):
+        return float(np.nextafter(thresholds[-1], -np.inf))
+    # Halfway between neighbouring scores, so new customers near the edge split evenly
+    return float(thresholds[k - 1] + thresholds[k]) / 2
+
+
+def optimize_risk_bands(curve, campaign=None):
+    """Cutoffs maximizing the campaign's expected net value on scored validation customers.
+
+    `curve` is a ScoreCurve (or a (y_true, churn_probs) pair). HIGH customers
+    get the HIGH action and MEDIUM customers the cheaper MEDIUM one. Every
+    contact costs its action's cost, and each churner reached is worth
+    customer_value * retention_rate. With the scores sorted once, the value
+    of calling the top k distinct scores positive is a cumulative sum for
+    each action. For a MEDIUM boundary m, the best HIGH boundary h <= m
+    is a running maximum, so every pair is searched in O(n). Boundaries
+    contacting more than contact_capacity of the customers are skipped.
+    Contacting nobody is allowed and wins when no band pays for itself.
+    """
+    if not isinstance(curve, ScoreCurve):
+        curve = ScoreCurve(*curve)
+    campaign = campaign or DEFAULT_CAMPAIGN
+    value = float(campaign['customer_value'])
+    high, medium = campaign['actions']['HIGH'], campaign['actions']['MEDIUM']
+
+    # Prefix k = the top k distinct scores; k = 0 contacts nobody
+    tp = np.r_[0, curve.tp].astype(np.float64)
+    contacted = np.r_[0, curve.tp + curve.fp].astype(np.float64)
+    value_high = value * high['retention_rate'] * tp - high['cost'] * contacted
+    value_medium = value * medium['retention_rate'] * tp - medium['cost'] * contacted
+
+    # net(h, m) = value_medium[m] + (value_high - value_medium)[h], for h <= m
+    gain = value_high - value_medium
+    running = np.maximum.accumulate(gain)
+    new_best = np.r_[True, gain[1:] > running[:-1]]
+    best_h = np.maximum.accumulate(np.where(new_best, np.arange(len(gain)), 0))
+    net = value_medium + gain[best_h]
+    net[contacted > campaign['contact_capacity'] * len(curve)] = -np.inf
+    m = int(np.argmax(net))
+    h = int(best_h[m])
+
+    cost = high['cost'] * contacted[h] + medium['cost'] * (contacted[m] - contacted[h])
+    n = max(len(curve), 1)
+    return {
+        'high': _cutoff(curve.thresholds, h),
+        'medium': _cutoff(curve.thresholds, m),
+        'high_fraction': float(contacted[h]) / n,
+        'medium_fraction': float(contacted[m] - contacted[h]) / n,
+        'churners_reached': float(tp[m]) / curve.n_pos if curve.n_pos else 0.0,
+        'net_value_per_customer': float(net[m]) / n,
+        'roi': float(net[m] / cost) if cost else 0.0,
+        'campaign': campaign
+    }
+
+
+def campaign_outcome(curve, cutoffs, campaign=None):
+    """What a campaign using the cutoffs contacts, reaches and earns on scored customers.
+
+    Reports fixed cutoffs on customers they were not chosen on (a test
+    set), with the same fields optimize_risk_bands returns plus the
+    precision of the contacted (HIGH and MEDIUM) customers.
+    """
+    if not isinstance(curve, ScoreCurve):
+        curve = ScoreCurve(*curve)
+    campaign = campaign or DEFAULT_CAMPAIGN
+    value = float(campaign['customer_value'])
+    high, medium = campaign['actions']['HIGH'], campaign['actions']['MEDIUM']
+
+    _, fp_high, _, tp_high = curve.confusion_at(cutoffs['high'])
+    _, fp_contacted, _, tp_contacted = curve.confusion_at(cutoffs['medium'])
+    n_high, n_contacted = tp_high + fp_high, tp_contacted + fp_contacted
+    cost = high['cost'] * n_high + medium['cost'] * (n_contacted - n_high)
+    net = value * (high['retention_rate'] * tp_high + medium['retention_rate'] * (tp_contacted - tp_high)) - cost
+    n = max(len(curve), 1)
+    return {
+        'high_fraction': float(n_high) / n,
+        'medium_fraction': float(n_contacted - n_high) / n,
+        'contacted_precision': float(tp_contacted) / n_contacted if n_contacted else 0.0,
+        'churners_reached': float(tp_contacted) / curve.n_pos if curve.n_pos else 0.0,
+        'net_value_per_customer': float(net) / n,
+        'roi': float(net / cost) if cost else 0.0
+    }
@@ -0,0 +1,230 @@
+"""
+Chunked, seedable synthetic customer data for training and capacity testing
+"""
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tabular_io import ChunkWriter
+
+# Rows are generated in fixed blocks, each from its own stream seeded by
+# (seed, block index). Row i therefore has the same values however the
+# data is chunked, sharded or spread over processes.
+BLOCK_SIZE = 1 << 16
+DEFAULT_CHUNK_ROWS = 16 * BLOCK_SIZE
+PROFILES = ('enhanced', 'haryana')
+CHANNELS = np.array(['web', 'mobile', 'app'])
+
+# Smallest dtype that holds each column's range
+COMPACT_DTYPES = {
+    'enhanced': {
+        'customer_id': np.uint32, 'customer_age': np.int8, 'account_age_days': np.int16,
+        'total_purchases': np.int16, 'avg_order_value': np.float32, 'days_since_last_purchase': np.int16,
+        'website_visits': np.int16, 'email_open_rate': np.float32, 'support_tickets': np.int8,
+        'product_categories_browsed': np.int8, 'avg_session_duration_min': np.float32,
+        'loyalty_program': np.int8, 'discount_usage': np.int8, 'review_count': np.int8,
+        'payment_failures': np.int8, 'return_rate': np.float32, 'mobile_usage_pct': np.float32,
+        'churned': np.int8
+    },
+    'haryana': {
+        'customer_id': np.uint32, 'customer_age': np.int8, 'account_age_days': np.int16,
+        'total_purchases': np.int8, 'avg_order_value': np.int16, 'days_since_last_purchase': np.int16,
+        'website_visits': np.int8, 'email_open_rate': np.float32, 'support_tickets': np.int8,
+        'product_categories_browsed': np.int8, 'avg_session_duration_min': np.float32,
+        'loyalty_program': np.int8, 'discount_usage': np.int8, 'review_count': np.int8,
+        'payment_failures': np.int8, 'return_rate': np.float32, 'mobile_usage_pct': np.float32,
+        'churn_prob': np.float32, 'churned': np.int8
+    }
+}
+
+
+def _enhanced_block(rng, n):
+    """ChurnDataGenerator's e-commerce customers"""
+    # Customer demographics
+    customer_age = rng.normal(35, 12, n).clip(18, 75)
+    account_age_days = rng.exponential(365, n).clip(1, 2000)
+
+    # Purchase behavior
+    total_purchases = rng.poisson(8, n)
+    avg_order_value = rng.gamma(50, 2, n)
+    days_since_last_purchase = rng.exponential(30, n).clip(0, 365)
+
+    # Engagement metrics
+    website_visits = rng.poisson(15, n)
+    email_open_rate = rng.beta(3, 2, n)
+    support_tickets = rng.poisson(1, n)
+
+    # Product preferences
+    product_categories_browsed = rng.poisson(4, n)
+    avg_session_duration = rng.gamma(10, 2, n)
+
+    # Loyalty indicators
+    loyalty_program = (rng.random(n) < 0.4).astype(np.int64)
+    discount_usage = rng.poisson(2, n)
+    review_count = rng.poisson(1, n)
+
+    # Payment and returns
+    payment_failures = rng.poisson(0.5, n).clip(0, 10)
+    return_rate = rng.beta(2, 10, n)
+
+    # Device and channel
+    mobile_usage_pct = rng.beta(3, 3, n)
+    channel = rng.integers(0, len(CHANNELS), n)
+
+    # Churn target from realistic business logic plus noise (~35% churn)
+    churn_score = (
+        -0.3 * (days_since_last_purchase / 100) +
+        0.2 * (total_purchases / 10) +
+        0.15 * loyalty_program +
+        0.1 * email_open_rate +
+        -0.2 * (payment_failures / 5) +
+        -0.15 * (return_rate * 10) +
+        0.1 * (website_visits / 20) +
+        -0.1 * (support_tickets / 5)
+    )
+    churn_prob = 1 / (1 + np.exp(-churn_score + rng.normal(0, 0.5, n)))
+
+    return {
+        'customer_age': customer_age.round(0),
+        'account_age_days': account_age_days.round(0),
+        'total_purchases': total_purchases,
+        'avg_order_value': avg_order_value.round(2),
+        'days_since_last_purchase': days_since_last_purchase.round(0),
+        'website_visits': website_visits,
+        'email_open_rate': (email_open_rate * 100).round(2),
+        'support_tickets': support_tickets,
+        'product_categories_browsed': product_categories_browsed,
+        'avg_session_duration_min': avg_session_duration.round(2),
+        'loyalty_program': loyalty_program,
+        'discount_usage': discount_usage,
+        'review_count': review_count,
+        'payment_failures': payment_failures,
+        'return_rate': (return_rate * 100).round(2),
+        'mobile_usage_pct': (mobile_usage_pct * 100).round(2),
+        'channel': channel,
+        'churned': (churn_prob < 0.35).astype(np.int64)
+    }
+
+
+def _haryana_block(rng, n):
+    """train_model.py's Haryana retail customers"""
+    columns = {
+        'customer_age': rng.integers(20, 60, n),
+        'account_age_days': rng.integers(30, 1000, n),
+        'total_purchases': rng.integers(1, 20, n),
+        'avg_order_value': rng.integers(50, 5000, n),
+        'days_since_last_purchase': rng.integers(1, 200, n),
+        'website_visits': rng.integers(0, 40, n),
+        'email_open_rate': rng.uniform(0, 100, n),
+        'support_tickets': rng.poisson(1.2, n),
+        'product_categories_browsed': rng.integers(1, 12, n),
+        'avg_session_duration_min': rng.uniform(1, 25, n),
+        'loyalty_program': rng.integers(0, 2, n),
+        'discount_usage': rng.integers(0, 6, n),
+        'review_count': rng.integers(0, 10, n),
+        'payment_failures': rng.integers(0, 3, n),
+        'return_rate': rng.uniform(0, 40, n),
+        'mobile_usage_pct': rng.uniform(20, 95, n),
+        'channel': rng.integers(0, len(CHANNELS), n)
+    }
+
+    # Realistic churn labels
+    score = (
+        0.28 * (columns['days_since_last_purchase'] / 200) +
+        0.20 * (columns['support_tickets'] / 8) +
+        0.18 * (columns['return_rate'] / 40) +
+        0.14 * (1 - columns['email_open_rate'] / 100) +
+        0.12 * (columns['total_purchases'] < 3) +
+        0.10 * (1 - columns['loyalty_program']) +
+        0.08 * (columns['payment_failures'] / 3)
+    )
+    columns['churn_prob'] = score
+    columns['churned'] = (score > 0.45).astype(np.int64)
+    return columns
+
+
+BLOCK_GENERATORS = {'enhanced': _enhanced_block, 'haryana': _haryana_block}
+
+
+def block_rng(seed, block):
+    """Independent Generator for one block: child `block` of SeedSequence(seed)"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+
+def generate_range(start, stop, seed=42, profile='enhanced', compact=False):
+    """Rows [start, stop) of the dataset defined by (seed, profile).
+
+    customer_id is the 1-based row number. `compact` stores each column in
+    the smallest dtype that holds it and the channel as a category;
+    otherwise columns are int64/float64/str like the original generators.
+    """
+    if profile not in BLOCK_GENERATORS:
+        raise ValueError(f"Unknown profile '{profile}', expected one of {PROFILES}")
+    generate_block = BLOCK_GENERATORS[profile]
+    dtypes = COMPACT_DTYPES[profile] if compact else {}
+    data = {'customer_id': np.arange(start + 1, stop + 1, dtype=dtypes.get('customer_id', np.int64))}
+
+    # Every block is drawn whole and copied into preallocated columns, so
+    # peak memory is the output plus one block
+    for block in range(start // BLOCK_SIZE, max(stop - 1, start) // BLOCK_SIZE + 1):
+        columns = generate_block(block_rng(seed, block), BLOCK_SIZE)
+        lo = max(start - block * BLOCK_SIZE, 0)
+        hi = min(stop - block * BLOCK_SIZE, BLOCK_SIZE)
+        offset = block * BLOCK_SIZE + lo - start
+        for name, values in columns.items():
+            if name not in data:
+                data[name] = np.empty(stop - start, dtype=dtypes.get(name, values.dtype))
+            data[name][offset:offset + hi - lo] = values[lo:hi]
+
+    # Channels are drawn as codes into CHANNELS
+    codes = data['channel']
+    data['channel'] = pd.Categorical.from_codes(codes, categories=CHANNELS) if compact else CHANNELS[codes]
+    return pd.DataFrame(data, index=pd.RangeIndex(start, stop), copy=False)
+
+
+def iter_chunks(n_rows, chunk_rows=DEFAULT_CHUNK_ROWS, start=0, **kwargs):
+    """Yield rows [start, start + n_rows) as DataFrames of at most chunk_rows rows"""
+    for chunk_start in range(start, start + n_rows, chunk_rows):
+        yield generate_range(chunk_start, min(chunk_start + chunk_rows, start + n_rows), **kwargs)
+
+
+def write_dataset(path, n_rows, start=0, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+    """Stream rows [start, start + n_rows) into one CSV or Parquet file, a chunk at a time"""
+    writer = ChunkWriter(path)
+    try:
+        for chunk in iter_chunks(n_rows, chunk_rows, start=start, **kwargs):
+            writer.write(chunk)
+    finally:
+        writer.close()
+    return writer.rows_written
+
+
+def _write_shard(args):
+    path, start, stop, chunk_rows, kwargs = args
+    return path, write_dataset(path, stop - start, start=start, chunk_rows=chunk_rows, **kwargs)
+
+
+def write_shards(out_dir, n_rows, shard_rows, fmt='parquet', workers=1, chunk_rows=DEFAULT_CHUNK_ROWS,
+                 **kwargs):
+    """Write the dataset as part-00000.<fmt>, part-00001.<fmt>, ... of shard_rows rows each.
+
+    With workers > 1 shards are written in parallel by spawned processes.
+    Shard contents depend only on the seed and the row range, so any
+    combination of shard size, chunk size and worker count yields the same
+    rows. Returns [(path, rows)] in shard order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    suffix = 'parquet' if fmt == 'parquet' else 'csv'
+    tasks = [(os.path.join(out_dir, f"part-{i:05d}.{suffix}"), start, min(start + shard_rows, n_rows),
+              chunk_rows, kwargs)
+             for i, start in enumerate(range(0, n_rows, shard_rows))]
+    if workers <= 1 or len(tasks) <= 1:
+        return [_write_shard(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(_write_shard, tasks))
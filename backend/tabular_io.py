@@ -0,0 +1,83 @@
+"""
+Chunked CSV/Parquet reading and writing shared by the command-line tools
+"""
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # optional: needed for Parquet, and makes CSV output much faster
+    pa = pa_csv = pq = None
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+
+def is_parquet(path):
+    return path.lower().endswith(PARQUET_SUFFIXES)
+
+
+def require_pyarrow(path):
+    if pa is None:
+        raise ImportError(f"Reading or writing Parquet ({path}) requires pyarrow to be installed")
+
+
+def read_chunks(path, columns, chunk_size):
+    """Yield DataFrame chunks of `path` holding only the wanted columns that exist"""
+    wanted = set(columns)
+    if is_parquet(path):
+        require_pyarrow(path)
+        parquet_file = pq.ParquetFile(path)
+        present = [name for name in parquet_file.schema_arrow.names if name in wanted]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=present):
+            yield batch.to_pandas()
+    else:
+        dtypes = {'channel': str}
+        for chunk in pd.read_csv(path, usecols=lambda name: name in wanted, dtype=dtypes,
+                                 chunksize=chunk_size):
+            yield chunk
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a CSV or Parquet file.
+
+    Uses pyarrow's writers when installed (they release the GIL, so writing
+    overlaps the producer's work); CSV falls back to DataFrame.to_csv otherwise.
+    With `schema`, every chunk is cast to it; otherwise the first chunk's
+    types are used, which an empty first chunk leaves as nulls.
+    """
+
+    def __init__(self, path, schema=None):
+        self.path = path
+        self.schema = schema
+        self.parquet = is_parquet(path)
+        if self.parquet:
+            require_pyarrow(path)
+        self._writer = None
+        self._file = None
+        self.rows_written = 0
+
+    def write(self, df):
+        if pa is not None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.schema is not None:
+                table = table.cast(self.schema)
+            if self._writer is None:
+                if self.parquet:
+                    self._writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    self._writer = pa_csv.CSVWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.path, 'w', newline='')
+                df.to_csv(self._file, index=False)
+            else:
+                df.to_csv(self._file, index=False, header=False)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
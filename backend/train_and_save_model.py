@@ -4,64 +4,234 @@ Script to train the model and save artifacts for FastAPI backend
 import sys
 import os
 import json
+import copy
+import time
+import argparse
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
 
 # Add parent directory to path to import churn_prediction_system
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from churn_prediction_system import (
-    RealDataLoader, ChurnDataGenerator, ChurnPredictionModel
+    ChurnPredictionModel, acquire_data
 )
+from artifact_cache import ArtifactCache
+from model_export import fold_scaler_into_xgboost, unfold_scaler_from_xgboost, verify_folded_model
+from model_bundle import ModelBundle, write_bundle
+from tree_engine import CompiledForest
+from feature_plan import CHANNEL_CLASSES, CHANNEL_FEATURE
+from external_training import DEFAULT_CHUNK_ROWS, train_xgboost_external
+from risk_bands import DEFAULT_RISK_CUTOFFS, campaign_outcome, load_campaign, optimize_risk_bands
 
-def train_and_save():
-    """Train model and save artifacts"""
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "model.pkl")
+SCALER_PATH = os.path.join(os.path.dirname(__file__), "scaler.pkl")
+UNSCALED_MODEL_PATH = os.path.join(os.path.dirname(__file__), "model_unscaled.json")
+FEATURE_NAMES_PATH = os.path.join(os.path.dirname(__file__), "feature_names.json")
+BUNDLE_PATH = os.path.join(os.path.dirname(__file__), "model.bundle")
+# Every file save_artifacts writes
+ARTIFACT_PATHS = [MODEL_PATH, SCALER_PATH, UNSCALED_MODEL_PATH, FEATURE_NAMES_PATH, BUNDLE_PATH]
+
+def fold_and_verify(xgb_model, scaler, X_raw):
+    """Fold the scaler into the XGBoost thresholds and check the raw-input model on X_raw"""
+    folded_model = fold_scaler_into_xgboost(xgb_model, scaler)
+    max_diff, mismatch_rate = verify_folded_model(folded_model, xgb_model, scaler, X_raw)
+    print(f"✅ Folded model matches scaler+model on {len(X_raw)} rows "
+          f"(max |diff| = {max_diff:.2e}, mismatches: {mismatch_rate:.2%})")
+    return folded_model
+
+def export_model_bundle(path, folded_model, scaler, feature_names, X_raw, metadata=None, n_canary=256):
+    """Save the folded model, scaler params and feature names as one mmap-able bundle.
+
+    A sample of X_raw and the booster's own probabilities for it go in as
+    canary rows, which the server checks before a reload goes live.
+    """
+    forest = CompiledForest.from_booster(folded_model, backend='numpy')
+    rng = np.random.default_rng(0)
+    X_canary = np.asarray(X_raw, dtype=np.float32)[rng.choice(len(X_raw), min(n_canary, len(X_raw)), replace=False)]
+    header = write_bundle(
+        path, forest, feature_names, CHANNEL_CLASSES, scaler=scaler,
+        booster_raw=folded_model.get_booster().save_raw(raw_format='ubj'),
+        scaler_folded=True, metadata=dict(metadata or {}, model_type='xgboost'),
+        canary=(X_canary, folded_model.predict_proba(X_canary)[:, 1])
+    )
+    print(f"✅ Built model bundle (version {header['metadata']['model_version']})")
+
+def write_json(value, path):
+    with open(path, 'w') as f:
+        json.dump(value, f, indent=2)
+
+def replace_artifacts(artifacts):
+    """Write each (label, path, write) artifact to a temporary file, then move them all into place.
+
+    Nothing is replaced until every file was written, so a failure leaves
+    the previous artifacts together. The temporary name keeps the extension,
+    which xgboost's save_model reads to pick the format.
+    """
+    written = []
+    try:
+        for label, path, write in artifacts:
+            base, ext = os.path.splitext(path)
+            tmp_path = f"{base}.tmp{ext}"
+            written.append(tmp_path)
+            write(tmp_path)
+    except BaseException:
+        for tmp_path in written:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    for (label, path, _), tmp_path in zip(artifacts, written):
+        os.replace(tmp_path, path)
+        print(f"✅ Saved {label} to {path}")
+
+def fold_saved_artifacts(n_check_rows=20000):
+    """Fold existing model.pkl + scaler.pkl without retraining.
+
+    The check rows are drawn around the scaler's mean/scale and rounded to the
+    precisions seen in the data, which exercises split boundaries exactly.
+    """
+    xgb_model = joblib.load(MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    # Keep what the bundle recorded about the model (e.g. its risk bands); the version is recomputed
+    parent = ModelBundle(BUNDLE_PATH).metadata if os.path.exists(BUNDLE_PATH) else {}
+    metadata = {name: value for name, value in parent.items() if name not in ('model_version', 'model_type')}
+    
+    rng = np.random.default_rng(42)
+    X = scaler.mean_ + scaler.scale_ * rng.standard_normal((n_check_rows, len(scaler.mean_)))
+    X_check = np.vstack([X, np.round(X), np.round(X, 2)])
+    folded_model = fold_and_verify(xgb_model, scaler, X_check)
+    
+    with open(FEATURE_NAMES_PATH, 'r') as f:
+        feature_names = json.load(f)
+    replace_artifacts([
+        ('unscaled model', UNSCALED_MODEL_PATH, folded_model.save_model),
+        ('model bundle', BUNDLE_PATH, lambda path: export_model_bundle(
+            path, folded_model, scaler, feature_names, X_check, metadata=metadata))
+    ])
+
+def save_artifacts(xgb_model, scaler, feature_names, X_check_raw, metadata=None):
+    """Save model.pkl, scaler.pkl, feature_names.json and the folded serving artifacts.
+
+    The folded model is checked on X_check_raw before anything is written,
+    and the files are replaced together, so a failed export leaves the
+    previous model, scaler and bundle in place as one consistent set.
+    """
+    # A scaler-free copy of the model for serving, checked on the held-out set
+    folded_model = fold_and_verify(xgb_model, scaler, X_check_raw)
+    metadata = dict(metadata or {}, n_samples_seen=int(np.max(scaler.n_samples_seen_)),
+                    n_trees=xgb_model.get_booster().num_boosted_rounds())
+    
+    # The bundle goes last: it is what the server watches and reloads
+    replace_artifacts([
+        ('model', MODEL_PATH, lambda path: joblib.dump(xgb_model, path)),
+        ('scaler', SCALER_PATH, lambda path: joblib.dump(scaler, path)),
+        ('unscaled model', UNSCALED_MODEL_PATH, folded_model.save_model),
+        ('feature names', FEATURE_NAMES_PATH, lambda path: write_json(feature_names, path)),
+        ('model bundle', BUNDLE_PATH, lambda path: export_model_bundle(
+            path, folded_model, scaler, feature_names, X_check_raw, metadata=metadata))
+    ])
+
+def campaign_risk_bands(validation, test, campaign=None):
+    """Risk-band cutoffs for the bundle, chosen on validation (y, probs) and reported on test (y, probs)"""
+    bands = optimize_risk_bands(validation, campaign)
+    outcome = campaign_outcome(test, bands, campaign)
+    print(f"🎯 Risk bands (chosen on {len(validation[0]):,} validation rows): HIGH > {bands['high']:.3f}, "
+          f"MEDIUM > {bands['medium']:.3f}")
+    print(f"   Test set: {outcome['high_fraction']:.1%} HIGH, {outcome['medium_fraction']:.1%} MEDIUM, "
+          f"contacted precision {outcome['contacted_precision']:.1%}, "
+          f"{outcome['churners_reached']:.1%} of churners reached, ROI {outcome['roi']:.1%}")
+    return dict(bands, test=outcome)
+
+def fixed_risk_bands():
+    """No campaign given: the bundle records no bands and serving keeps DEFAULT_RISK_CUTOFFS"""
+    print(f"🎯 Risk bands: fixed HIGH > {DEFAULT_RISK_CUTOFFS['high']}, MEDIUM > {DEFAULT_RISK_CUTOFFS['medium']} "
+          f"(pass --campaign to optimize them)")
+    return None
+
+def customer_matrix(df, feature_names):
+    """Raw feature rows and churn labels of a customer frame, channel encoded as in training"""
+    if CHANNEL_FEATURE in feature_names and CHANNEL_FEATURE not in df.columns:
+        codes = pd.Index(CHANNEL_CLASSES).get_indexer(df['channel'])
+        if (codes < 0).any():
+            raise ValueError(f"Unknown channel values: {sorted(set(df['channel'][codes < 0]))}")
+        df = df.assign(**{CHANNEL_FEATURE: codes})
+    missing = [name for name in feature_names if name not in df.columns]
+    if missing:
+        raise ValueError(f"Batch is missing feature columns: {missing}")
+    return df[feature_names].to_numpy(dtype=np.float64), df['churned'].to_numpy()
+
+def incremental_update(xgb_model, scaler, X_new, y_new, n_new_trees=50, validation_fraction=0.2,
+                       early_stopping_rounds=10):
+    """Warm-start the model and scaler on a new batch of raw rows.
+
+    The scaler's running mean and variance absorb the batch
+    (StandardScaler.partial_fit). Boosting continues from the existing
+    trees folded into raw space: trees don't depend on the scaling, and raw
+    thresholds don't move when the scaler does. Up to n_new_trees rounds
+    are added, stopping once logloss on a validation_fraction slice of the
+    batch has not improved for early_stopping_rounds. The result is
+    unfolded into the updated scaler's space and keeps xgb_model's
+    parameters. Returns (model, scaler) like model.pkl and scaler.pkl.
+    """
+    new_scaler = copy.deepcopy(scaler).partial_fit(X_new)
+    params = xgb_model.get_params()
+    X_fit, X_val, y_fit, y_val = train_test_split(X_new, y_new, test_size=validation_fraction,
+                                                  random_state=42, stratify=y_new)
+    raw_model = type(xgb_model)(**dict(params, n_estimators=n_new_trees,
+                                       early_stopping_rounds=early_stopping_rounds))
+    raw_model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False,
+                  xgb_model=fold_scaler_into_xgboost(xgb_model, scaler).get_booster())
+    
+    # Drop the rounds boosted past the best validation score
+    booster = raw_model.get_booster()[:raw_model.best_iteration + 1]
+    return unfold_scaler_from_xgboost(booster, new_scaler).set_params(**params), new_scaler
+
+def train_and_save(use_cache=True, campaign=None):
+    """Train model and save artifacts, skipping stages whose inputs and code are unchanged"""
     print("="*80)
     print("TRAINING MODEL FOR FASTAPI BACKEND")
     print("="*80)
+    cache = ArtifactCache(enabled=use_cache)
     
     # Step 1: Load Data
     print("\n[1/3] Loading data...")
-    loader = RealDataLoader()
-    ibm_df, source = loader.load_ibm_data()
-    
-    if ibm_df is not None:
-        df = loader.prepare_ibm_data(ibm_df)
-        data_source = source
-    else:
-        print("⚠️  Real data not available. Using synthetic data...")
-        generator = ChurnDataGenerator(n_samples=5000)
-        df = generator.generate_data()
-        data_source = 'synthetic'
+    data_key, (df, data_source) = acquire_data(cache)
     
     # Step 2: Train Model
     print("\n[2/3] Training model...")
-    model_trainer = ChurnPredictionModel(df, data_source)
+    model_trainer = ChurnPredictionModel(df, data_source, cache=cache, data_key=data_key)
     model_trainer.preprocess_data()
     
     # Train XGBoost (best performing model typically)
     print("Training XGBoost model...")
-    model_trainer.train_xgboost()
+    model_trainer.train_models(['xgboost'])
     
     # Step 3: Save Artifacts
     print("\n[3/3] Saving artifacts...")
     
-    # Save model
-    model_path = os.path.join(os.path.dirname(__file__), "model.pkl")
-    joblib.dump(model_trainer.models['xgboost'], model_path)
-    print(f"✅ Saved model to {model_path}")
-    
-    # Save scaler
-    scaler_path = os.path.join(os.path.dirname(__file__), "scaler.pkl")
-    joblib.dump(model_trainer.scaler, scaler_path)
-    print(f"✅ Saved scaler to {scaler_path}")
+    def save():
+        xgb_model = model_trainer.models['xgboost']
+        X_test_raw = model_trainer.scaler.inverse_transform(model_trainer.X_test)
+        bands = campaign_risk_bands(
+            (model_trainer.y_train, model_trainer.out_of_fold_proba('xgboost')),
+            (model_trainer.y_test, xgb_model.predict_proba(model_trainer.X_test)[:, 1]), campaign
+        ) if campaign is not None else fixed_risk_bands()
+        save_artifacts(xgb_model, model_trainer.scaler, model_trainer.feature_names, X_test_raw,
+                       metadata={'data_source': data_source, 'training_mode': 'full', 'training_round': 0,
+                                 'risk_bands': bands})
     
-    # Save feature names
-    feature_names_path = os.path.join(os.path.dirname(__file__), "feature_names.json")
-    with open(feature_names_path, 'w') as f:
-        json.dump(model_trainer.feature_names, f, indent=2)
-    print(f"✅ Saved feature names to {feature_names_path}")
+    # Artifacts are rewritten when the model or campaign changed, or any of them was replaced or
+    # deleted since (e.g. by --incremental)
+    xgb_key = model_trainer.stage_keys['train xgboost']
+    save_key = cache.key('save artifacts', [xgb_key, data_source], params=campaign,
+                         code=[save_artifacts, fold_and_verify, export_model_bundle, campaign_risk_bands,
+                               fixed_risk_bands, optimize_risk_bands, campaign_outcome,
+                               ChurnPredictionModel.out_of_fold_proba]) if xgb_key else None
+    cache.output(ARTIFACT_PATHS, save_key, save)
     
     print("\n" + "="*80)
     print("✅ MODEL TRAINING COMPLETE!")
@@ -72,6 +242,124 @@ def train_and_save():
     print("\nYou can now start the FastAPI server with:")
     print("  uvicorn backend.main:app --reload")
 
-if __name__ == "__main__":
-    train_and_save()
+def retrain_incremental(batch_path, n_new_trees=50, holdout=0.2, validation_fraction=0.2, campaign=None):
+    """Continue the saved model on a new customer batch and save it as the next version.
+
+    A holdout share of the batch reports ROC-AUC and campaign value; a
+    validation_fraction of the rest is kept out of training to choose the risk bands.
+    """
+    print("="*80)
+    print("INCREMENTAL RETRAINING FROM A NEW CUSTOMER BATCH")
+    print("="*80)
+    
+    xgb_model = joblib.load(MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    with open(FEATURE_NAMES_PATH, 'r') as f:
+        feature_names = json.load(f)
+    parent = ModelBundle(BUNDLE_PATH).metadata if os.path.exists(BUNDLE_PATH) else {}
+    
+    df = pd.read_parquet(batch_path) if batch_path.endswith(('.parquet', '.pq')) else pd.read_csv(batch_path)
+    X, y = customer_matrix(df, feature_names)
+    X_fit, X_eval, y_fit, y_eval = train_test_split(X, y, test_size=holdout, random_state=42, stratify=y)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_fit, y_fit, test_size=validation_fraction,
+                                                  random_state=42, stratify=y_fit)
+    print(f"📊 Batch: {len(X):,} customers ({len(X_fit):,} to train on, {len(X_val):,} to choose risk "
+          f"bands on, {len(X_eval):,} held out)")
+    print(f"   Parent model: {parent.get('model_version', 'unknown')} "
+          f"({xgb_model.get_booster().num_boosted_rounds()} trees, "
+          f"{int(np.max(scaler.n_samples_seen_)):,} samples seen)")
+    
+    started_at = time.perf_counter()
+    model, new_scaler = incremental_update(xgb_model, scaler, X_fit, y_fit, n_new_trees=n_new_trees)
+    elapsed = time.perf_counter() - started_at
+    added = model.get_booster().num_boosted_rounds() - xgb_model.get_booster().num_boosted_rounds()
+    
+    auc_before = roc_auc_score(y_eval, xgb_model.predict_proba(scaler.transform(X_eval))[:, 1])
+    p_eval = model.predict_proba(new_scaler.transform(X_eval))[:, 1]
+    auc_after = roc_auc_score(y_eval, p_eval)
+    print(f"✅ Added {added} trees (at most {n_new_trees}) in {elapsed:.2f}s")
+    print(f"   Held-out ROC-AUC: {auc_before:.4f} -> {auc_after:.4f}")
+    bands = campaign_risk_bands((y_val, model.predict_proba(new_scaler.transform(X_val))[:, 1]),
+                                (y_eval, p_eval), campaign) if campaign is not None else fixed_risk_bands()
+    
+    print("\nSaving artifacts...")
+    save_artifacts(model, new_scaler, feature_names, X_eval, metadata={
+        'data_source': parent.get('data_source'),
+        'training_mode': 'incremental',
+        'training_round': parent.get('training_round', 0) + 1,
+        'parent_model_version': parent.get('model_version'),
+        'risk_bands': bands
+    })
+
+def train_from_files(paths, chunk_rows=DEFAULT_CHUNK_ROWS, external_memory=True, campaign=None):
+    """Train from CSV/Parquet customer files (or shard directories) without loading them at once"""
+    print("="*80)
+    print("OUT-OF-CORE TRAINING FROM CUSTOMER FILES")
+    print("="*80)
+    
+    feature_names = None
+    if os.path.exists(FEATURE_NAMES_PATH):
+        with open(FEATURE_NAMES_PATH, 'r') as f:
+            feature_names = json.load(f)
+    
+    print(f"📂 Streaming {', '.join(paths)} in chunks of {chunk_rows:,} rows "
+          f"({'external-memory' if external_memory else 'in-memory'} quantized matrix)")
+    result = train_xgboost_external(paths, feature_names, chunk_rows=chunk_rows, external_memory=external_memory)
+    print(f"📊 {result['n_train']:,} training rows, {result['n_validation']:,} validation rows, "
+          f"{result['n_test']:,} test rows")
+    for stage, seconds in result['timings'].items():
+        print(f"   {stage:12s} {seconds:8.2f}s")
+    print(f"✅ Test ROC-AUC: {result['metrics']['roc_auc']:.4f}, accuracy: {result['metrics']['accuracy']:.4f}")
+    bands = campaign_risk_bands((result['y_validation'], result['p_validation']),
+                                (result['y_test'], result['p_test']), campaign) if campaign is not None else fixed_risk_bands()
+    
+    print("\nSaving artifacts...")
+    save_artifacts(result['model'], result['scaler'], result['feature_names'], result['X_check_raw'], metadata={
+        'data_source': ', '.join(os.path.basename(os.path.normpath(path)) for path in paths),
+        'training_mode': 'external',
+        'training_round': 0,
+        'risk_bands': bands
+    })
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the churn model and save serving artifacts")
+    parser.add_argument("--fold-only", action="store_true",
+                        help="fold the existing model.pkl + scaler.pkl into model_unscaled.json and "
+                             "model.bundle without retraining")
+    parser.add_argument("--incremental", metavar="BATCH",
+                        help="continue the saved model on a new customer batch (.csv/.parquet with a "
+                             "churned column) instead of training from scratch")
+    parser.add_argument("--new-trees", type=int, default=50,
+                        help="most boosting rounds added by --incremental; stops early once a "
+                             "validation slice of the batch stops improving (default: 50)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="retrain from scratch and rewrite the artifacts even when nothing changed")
+    parser.add_argument("--from-files", nargs="+", metavar="PATH",
+                        help="train from CSV/Parquet customer files or shard directories (e.g. from "
+                             "`cli.py generate --shard-rows`), streamed in chunks")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"rows per chunk read by --from-files (default: {DEFAULT_CHUNK_ROWS:,})")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="with --from-files, keep the quantized training matrix in RAM instead "
+                             "of spilling its pages to disk")
+    parser.add_argument("--campaign", metavar="JSON",
+                        help="retention campaign costs, retained value and contact capacity (shaped like "
+                             "risk_bands.DEFAULT_CAMPAIGN) used to choose the risk bands saved in the bundle; "
+                             "without it the bands stay at 0.7 / 0.4")
+    parser.add_argument("--contact-capacity", type=float, default=None,
+                        help="most customers the campaign can contact, as a fraction (overrides the "
+                             "--campaign file's)")
+    args = parser.parse_args()
+    if args.contact_capacity is not None and not args.campaign:
+        parser.error("--contact-capacity needs --campaign")
+    campaign = load_campaign(args.campaign, args.contact_capacity)
+    
+    if args.fold_only:
+        fold_saved_artifacts()
+    elif args.incremental:
+        retrain_incremental(args.incremental, n_new_trees=args.new_trees, campaign=campaign)
+    elif args.from_files:
+        train_from_files(args.from_files, chunk_rows=args.chunk_rows, external_memory=not args.in_memory,
+                         campaign=campaign)
+    else:
+        train_and_save(use_cache=not args.no_cache, campaign=campaign)
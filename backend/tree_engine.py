@@ -0,0 +1,244 @@
+"""
+Compiled tree-ensemble inference engine for the served XGBoost model
+"""
+import json
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: only needed for the "numba" backend
+    numba = None
+
+BACKENDS = ('numpy', 'numba', 'xgboost')
+SUPPORTED_OBJECTIVES = ('binary:logistic', 'reg:logistic')
+# Complete-tree layout stores 2**depth leaves per tree
+MAX_DEPTH = 16
+
+
+def _parse_base_score(value):
+    """base_score is stored as '5E-1' or, in newer releases, '[5E-1]'"""
+    return float(str(value).strip('[]').split(',')[0])
+
+
+def default_backend():
+    """numba when it is installed, otherwise the pure NumPy walker"""
+    return 'numba' if numba is not None else 'numpy'
+
+
+class CompiledForest:
+    """XGBoost booster flattened into NumPy arrays.
+
+    Each tree is laid out as a complete binary tree of depth `max_depth`:
+    internal node i has children 2i+1 / 2i+2, so traversal needs no child
+    pointers. Per tree we keep the split feature index, threshold and
+    missing-value direction of every internal node plus the 2**max_depth
+    leaf values. Leaves above the bottom level are padded with NaN-threshold
+    nodes that always go left and copy the leaf value down.
+
+    Margins are accumulated tree by tree in float32 on float32 inputs, the
+    same arithmetic xgboost uses, so outputs match predict_proba to ~1e-7.
+    """
+
+    def __init__(self, feature, threshold, default_right, leaf_value, base_margin,
+                 n_features, backend=None, chunk_size=8192, model_json=None, model_raw=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.default_right = default_right
+        self.leaf_value = leaf_value
+        self.base_margin = np.float32(base_margin)
+        self.n_features = int(n_features)
+        self.chunk_size = int(chunk_size)
+        # Source model, kept only to rebuild a Booster for the reference backend:
+        # a JSON dict, or raw UBJ/JSON bytes (or a callable returning them)
+        self.model_json = model_json
+        self.model_raw = model_raw
+        self._booster = None
+        self.set_backend(backend or default_backend())
+
+    @property
+    def n_trees(self):
+        return self.feature.shape[0]
+
+    @property
+    def max_depth(self):
+        return int(np.log2(self.leaf_value.shape[1]))
+
+    @classmethod
+    def from_json(cls, model_json, **kwargs):
+        """Build from xgboost's native JSON model (dict)"""
+        learner = model_json['learner']
+        objective = learner['objective']['name']
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Unsupported objective '{objective}', expected one of {SUPPORTED_OBJECTIVES}")
+
+        base_score = _parse_base_score(learner['learner_model_param']['base_score'])
+        base_margin = np.log(base_score / (1.0 - base_score))
+        n_features = int(learner['learner_model_param']['num_feature'])
+        trees = learner['gradient_booster']['model']['trees']
+
+        for tree in trees:
+            if np.any(np.asarray(tree['split_type']) != 0):
+                raise ValueError("Categorical splits are not supported")
+        depth = max(cls._tree_depth(tree['left_children'], tree['right_children']) for tree in trees)
+        if depth > MAX_DEPTH:
+            raise ValueError(f"Trees of depth {depth} exceed the supported maximum of {MAX_DEPTH}")
+
+        n_internal = 2 ** depth - 1
+        feature = np.zeros((len(trees), n_internal), dtype=np.int32)
+        threshold = np.full((len(trees), n_internal), np.nan, dtype=np.float32)
+        default_right = np.zeros((len(trees), n_internal), dtype=bool)
+        leaf_value = np.zeros((len(trees), n_internal + 1), dtype=np.float32)
+
+        for t, tree in enumerate(trees):
+            left, right = tree['left_children'], tree['right_children']
+            conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+            stack = [(0, 0)]  # (node id in xgboost tree, position in complete tree)
+            while stack:
+                node, pos = stack.pop()
+                if left[node] == -1:
+                    # Copy the leaf to every bottom-level position under pos
+                    first, count = pos, 1
+                    while first < n_internal:
+                        first, count = 2 * first + 1, 2 * count
+                    leaf_value[t, first - n_internal:first - n_internal + count] = conditions[node]
+                    continue
+                feature[t, pos] = tree['split_indices'][node]
+                threshold[t, pos] = conditions[node]
+                default_right[t, pos] = not tree['default_left'][node]
+                stack.append((left[node], 2 * pos + 1))
+                stack.append((right[node], 2 * pos + 2))
+
+        return cls(feature, threshold, default_right, leaf_value, base_margin, n_features,
+                   model_json=model_json, **kwargs)
+
+    @classmethod
+    def from_booster(cls, booster, **kwargs):
+        """Build from an xgboost Booster or XGBClassifier"""
+        if hasattr(booster, 'get_booster'):
+            booster = booster.get_booster()
+        return cls.from_json(json.loads(booster.save_raw(raw_format='json')), **kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Build from a model saved with save_model(...json)"""
+        with open(path, 'r') as f:
+            return cls.from_json(json.load(f), **kwargs)
+
+    @staticmethod
+    def _tree_depth(left, right):
+        depth = 0
+        level = [0]
+        while True:
+            level = [c for node in level for c in (left[node], right[node]) if c != -1]
+            if not level:
+                return depth
+            depth += 1
+
+    def set_backend(self, backend):
+        """Select 'numpy', 'numba' (needs numba installed) or 'xgboost' (reference)"""
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+        if backend == 'numba' and numba is None:
+            raise ImportError("The 'numba' backend requires numba to be installed")
+        if backend == 'xgboost' and self._booster is None:
+            raw = self.model_raw() if callable(self.model_raw) else self.model_raw
+            if raw is None and self.model_json is not None:
+                raw = json.dumps(self.model_json).encode('utf-8')
+            if raw is None:
+                raise ValueError("The 'xgboost' backend needs the forest built from a model")
+            import xgboost as xgb
+            self._booster = xgb.Booster()
+            self._booster.load_model(bytearray(raw))
+        self.backend = backend
+
+    def predict_margin(self, X):
+        """Raw log-odds for each row of X (n_samples, n_features)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input of shape (n, {self.n_features}), got {X.shape}")
+
+        if self.backend == 'numba':
+            out = np.empty(len(X), dtype=np.float32)
+            _predict_margin_numba(X, self.feature, self.threshold, self.default_right,
+                                  self.leaf_value, self.base_margin, bool(np.isnan(X).any()), out)
+            return out
+        if self.backend == 'xgboost':
+            return self._booster.inplace_predict(X, predict_type='margin')
+
+        out = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), self.chunk_size):
+            stop = min(start + self.chunk_size, len(X))
+            out[start:stop] = self._predict_margin_numpy(X[start:stop])
+        return out
+
+    def predict(self, X):
+        """Churn probabilities for each row of X"""
+        margin = self.predict_margin(X).astype(np.float64)
+        return 1.0 / (1.0 + np.exp(-margin))
+
+    def predict_proba(self, X):
+        """sklearn-style (n_samples, 2) class probabilities"""
+        p = self.predict(X)
+        return np.column_stack([1.0 - p, p])
+
+    def _predict_margin_numpy(self, X):
+        # Walk all trees for all rows one level at a time: pos is (n_rows, n_trees)
+        n_internal = self.feature.shape[1]
+        feature = self.feature.ravel()
+        threshold = self.threshold.ravel()
+        default_right = self.default_right.ravel()
+        tree_offset = np.arange(self.n_trees, dtype=np.int32) * n_internal
+
+        X_flat = X.ravel()
+        row_offset = (np.arange(len(X), dtype=np.int32) * self.n_features)[:, None]
+        has_missing = np.isnan(X_flat).any()
+        pos = np.zeros((len(X), self.n_trees), dtype=np.int32)
+        for _ in range(self.max_depth):
+            node = tree_offset + pos
+            x = X_flat.take(row_offset + feature.take(node))
+            go_right = x >= threshold.take(node)
+            if has_missing:
+                go_right |= np.isnan(x) & default_right.take(node)
+            pos = 2 * pos + 1 + go_right
+
+        # Sequential float32 accumulation (base, tree 0, tree 1, ...) like xgboost
+        leaf_offset = np.arange(self.n_trees, dtype=np.int32) * (n_internal + 1) - n_internal
+        leaf_values = self.leaf_value.ravel().take(leaf_offset + pos)
+        leaf_values[:, 0] += self.base_margin
+        return np.cumsum(leaf_values, axis=1, dtype=np.float32)[:, -1]
+
+
+if numba is not None:
+    # Compiled single-threaded and without the GIL: callers parallelize across
+    # worker threads or processes, and numba's own threading layers don't mix
+    # well with server worker threads
+    @numba.njit(cache=True, nogil=True)
+    def _predict_margin_numba(X, feature, threshold, default_right, leaf_value, base_margin, has_missing, out):
+        # Blocks of rows walk one tree level at a time: the inner row loop has no
+        # dependencies between iterations, which keeps several lookups in flight
+        n_rows = X.shape[0]
+        n_trees, n_internal = feature.shape
+        depth = 0
+        while (1 << depth) - 1 < n_internal:
+            depth += 1
+        block = 64
+        for b in range((n_rows + block - 1) // block):
+            start = b * block
+            stop = min(start + block, n_rows)
+            pos = np.empty(stop - start, dtype=np.intp)
+            margin = np.full(stop - start, base_margin, dtype=np.float32)
+            for t in range(n_trees):
+                pos[:] = 0
+                for _ in range(depth):
+                    for j in range(stop - start):
+                        p = pos[j]
+                        x = X[start + j, feature[t, p]]
+                        go_right = x >= threshold[t, p]
+                        if has_missing:
+                            go_right = go_right | (np.isnan(x) & default_right[t, p])
+                        pos[j] = 2 * p + 1 + go_right
+                for j in range(stop - start):
+                    margin[j] += leaf_value[t, pos[j] - n_internal]
+            out[start:stop] = margin
+else:
+    _predict_margin_numba = None
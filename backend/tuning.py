@@ -0,0 +1,289 @@
+"""
+Hyperparameter search for the XGBoost and Random Forest churn models
+
+Successive halving over stratified cross-validation: many configurations
+start with few trees, and only the best 1/eta of each rung go on with eta
+times more. XGBoost trials also stop early on a slice of each fold's
+training rows, so the tuned n_estimators is the number of rounds that
+actually helped, while the validation fold only scores the trial. Trials run
+on a process pool with a fixed number of threads each. The best
+configuration per model is written to best_params.json, which
+ChurnPredictionModel.train_xgboost / train_random_forest read.
+
+Usage:
+    python backend/tuning.py [--models xgboost random_forest] [--trials 27] [--folds 3]
+                             [--eta 3] [--workers N] [--threads-per-trial 1]
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+import xgboost as xgb
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+BEST_PARAMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "best_params.json")
+
+# Hyperparameters the training pipeline uses when best_params.json has none for a model
+DEFAULT_HYPERPARAMETERS = {
+    'random_forest': {
+        'n_estimators': 200,
+        'max_depth': 10,
+        'min_samples_split': 20,
+        'min_samples_leaf': 10
+    },
+    'xgboost': {
+        'n_estimators': 200,
+        'max_depth': 6,
+        'learning_rate': 0.05,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8
+    }
+}
+
+# Most trees a trial can reach (the last rung); earlier rungs get 1/eta as many
+MAX_ESTIMATORS = {'random_forest': 400, 'xgboost': 800}
+# Rounds without an AUC gain on the early-stopping rows before an XGBoost fold stops
+EARLY_STOPPING_ROUNDS = 30
+# Share of each fold's training rows XGBoost holds out to stop early on
+EARLY_STOPPING_FRACTION = 0.2
+# Histogram bins of the fold DMatrix, shared by every XGBoost trial
+MAX_BIN = 256
+SEED = 42
+
+
+def load_hyperparameters(model_name, path=BEST_PARAMS_PATH):
+    """DEFAULT_HYPERPARAMETERS for model_name, overridden by its entry in best_params.json"""
+    params = dict(DEFAULT_HYPERPARAMETERS.get(model_name, {}))
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            params.update(json.load(f).get(model_name, {}).get('params', {}))
+    return params
+
+
+def sample_config(model_name, rng):
+    """One random configuration from the model's search space (without n_estimators)"""
+    if model_name == 'xgboost':
+        return {
+            'max_depth': int(rng.integers(3, 11)),
+            'learning_rate': float(np.exp(rng.uniform(np.log(0.01), np.log(0.3)))),
+            'subsample': float(rng.uniform(0.6, 1.0)),
+            'colsample_bytree': float(rng.uniform(0.5, 1.0)),
+            'min_child_weight': float(np.exp(rng.uniform(0.0, np.log(20)))),
+            'reg_lambda': float(np.exp(rng.uniform(np.log(0.1), np.log(10))))
+        }
+    if model_name == 'random_forest':
+        max_depth = [6, 8, 10, 14, 20, None][rng.integers(6)]
+        return {
+            'max_depth': max_depth,
+            'min_samples_split': int(rng.integers(2, 41)),
+            'min_samples_leaf': int(rng.integers(1, 21)),
+            'max_features': ['sqrt', 0.5, 0.8][rng.integers(3)]
+        }
+    raise ValueError(f"No search space for model '{model_name}'")
+
+
+def halving_rungs(n_trials, eta, max_estimators):
+    """Trees per trial at each rung: max_estimators / eta**k up to max_estimators"""
+    n_rungs = 1 + int(math.log(n_trials) / math.log(eta) + 1e-9) if n_trials > 1 else 1
+    return [max(1, max_estimators // eta ** k) for k in reversed(range(n_rungs))]
+
+
+# Per-process state: the training rows, fold indices and fold matrices built on first use
+_worker = {}
+
+
+def _init_worker(X, y, folds, n_threads):
+    """Keep the data and fold splits in the worker; fold matrices are built lazily and reused"""
+    _worker.clear()
+    _worker.update(X=X, y=y, folds=folds, n_threads=n_threads, dmatrix={}, arrays={})
+
+
+def _fold_arrays(fold):
+    """(X_fit, y_fit, X_valid, y_valid) of a fold, gathered once per worker"""
+    if fold not in _worker['arrays']:
+        fit_idx, valid_idx = _worker['folds'][fold]
+        X, y = _worker['X'], _worker['y']
+        _worker['arrays'][fold] = (X[fit_idx], y[fit_idx], X[valid_idx], y[valid_idx])
+    return _worker['arrays'][fold]
+
+
+def _fold_dmatrix(fold):
+    """Quantized (fit, early-stopping) DMatrix pair split from a fold's training rows.
+
+    Built once per worker and shared by every XGBoost trial; the fold's
+    validation rows stay out of both, so they only score the trial.
+    """
+    if fold not in _worker['dmatrix']:
+        X_fit, y_fit, _, _ = _fold_arrays(fold)
+        X_fit, X_stop, y_fit, y_stop = train_test_split(X_fit, y_fit, test_size=EARLY_STOPPING_FRACTION,
+                                                        random_state=SEED, stratify=y_fit)
+        dfit = xgb.QuantileDMatrix(X_fit, y_fit, max_bin=MAX_BIN, nthread=_worker['n_threads'])
+        dstop = xgb.QuantileDMatrix(X_stop, y_stop, ref=dfit, nthread=_worker['n_threads'])
+        _worker['dmatrix'][fold] = (dfit, dstop)
+    return _worker['dmatrix'][fold]
+
+
+def evaluate_trial(model_name, config, n_estimators):
+    """Mean validation ROC-AUC of config over the folds, and the trees it used"""
+    scores, used = [], []
+    for fold in range(len(_worker['folds'])):
+        X_fit, y_fit, X_valid, y_valid = _fold_arrays(fold)
+        if model_name == 'xgboost':
+            dfit, dstop = _fold_dmatrix(fold)
+            params = dict(config, objective='binary:logistic', eval_metric='auc', tree_method='hist',
+                          max_bin=MAX_BIN, seed=SEED, nthread=_worker['n_threads'])
+            booster = xgb.train(params, dfit, num_boost_round=n_estimators, evals=[(dstop, 'stop')],
+                                early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+            n_rounds = booster.best_iteration + 1
+            churn_probs = booster.inplace_predict(X_valid, iteration_range=(0, n_rounds))
+            scores.append(roc_auc_score(y_valid, churn_probs))
+            used.append(n_rounds)
+        else:
+            model = RandomForestClassifier(n_estimators=n_estimators, random_state=SEED,
+                                           n_jobs=_worker['n_threads'], **config)
+            model.fit(X_fit, y_fit)
+            scores.append(roc_auc_score(y_valid, model.predict_proba(X_valid)[:, 1]))
+            used.append(n_estimators)
+    return float(np.mean(scores)), int(round(np.mean(used)))
+
+
+def _evaluate_job(job):
+    return evaluate_trial(*job)
+
+
+def successive_halving(model_name, X, y, n_trials=27, n_folds=3, eta=3, n_workers=1, threads_per_trial=1,
+                       max_estimators=None, seed=SEED):
+    """Tune model_name on (X, y); returns the best configuration and the search history.
+
+    Fold splits are drawn once and shared by every trial. Each rung trains
+    the surviving trials with more trees on n_workers processes (spawned,
+    threads_per_trial threads each), then keeps the best 1/eta by mean
+    validation ROC-AUC. The returned params include n_estimators: the last
+    rung's trees for the forest, the mean early-stopped rounds for XGBoost.
+    """
+    rng = np.random.default_rng(seed)
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed).split(X, y))
+    trials = [{'trial': i, 'config': sample_config(model_name, rng)} for i in range(n_trials)]
+    rungs = halving_rungs(n_trials, eta, max_estimators or MAX_ESTIMATORS[model_name])
+    history = []
+
+    if n_workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker, initargs=(X, y, folds, threads_per_trial)
+        )
+        run = lambda jobs: list(executor.map(_evaluate_job, jobs))
+    else:
+        executor = None
+        _init_worker(X, y, folds, threads_per_trial)
+        run = lambda jobs: [_evaluate_job(job) for job in jobs]
+    try:
+        for rung, n_estimators in enumerate(rungs):
+            started = time.perf_counter()
+            results = run([(model_name, trial['config'], n_estimators) for trial in trials])
+            for trial, (score, used) in zip(trials, results):
+                trial.update(score=score, n_estimators=used)
+                history.append(dict(trial, rung=rung, budget=n_estimators))
+            trials.sort(key=lambda trial: trial['score'], reverse=True)
+            print(f"   Rung {rung + 1}/{len(rungs)}: {len(trials)} trials x {n_estimators} trees, "
+                  f"best CV ROC-AUC {trials[0]['score']:.4f} ({time.perf_counter() - started:.1f}s)")
+            if rung < len(rungs) - 1:
+                trials = trials[:max(1, math.ceil(len(trials) / eta))]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    best = trials[0]
+    return {
+        'params': dict(best['config'], n_estimators=best['n_estimators']),
+        'cv_roc_auc': best['score'],
+        'n_trials': n_trials,
+        'n_folds': n_folds,
+        'rungs': rungs,
+        'history': history
+    }
+
+
+def save_best_params(results, path=BEST_PARAMS_PATH, **info):
+    """Merge {model_name: search result} into best_params.json, keeping other models' entries"""
+    best = {}
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            best = json.load(f)
+    tuned_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    for model_name, result in results.items():
+        best[model_name] = {
+            'params': result['params'],
+            'cv_roc_auc': result['cv_roc_auc'],
+            'n_trials': result['n_trials'],
+            'n_folds': result['n_folds'],
+            'rungs': result['rungs'],
+            'tuned_at': tuned_at,
+            **info
+        }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(best, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', choices=list(DEFAULT_HYPERPARAMETERS),
+                        default=list(DEFAULT_HYPERPARAMETERS), help="models to tune (default: both)")
+    parser.add_argument('--trials', type=int, default=27, help="configurations in the first rung (default: 27)")
+    parser.add_argument('--folds', type=int, default=3, help="stratified CV folds (default: 3)")
+    parser.add_argument('--eta', type=int, default=3,
+                        help="each rung keeps 1/eta of the trials and gives them eta times the trees (default: 3)")
+    parser.add_argument('--threads-per-trial', type=int, default=1,
+                        help="threads each trial's model may use (default: 1)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="trials run at once (default: CPUs / --threads-per-trial)")
+    parser.add_argument('--output', default=BEST_PARAMS_PATH, help=f"where to write the best configurations "
+                                                                   f"(default: {BEST_PARAMS_PATH})")
+    parser.add_argument('--no-cache', action='store_true', help="reload and preprocess the data from scratch")
+    args = parser.parse_args(argv)
+
+    # The pipeline pulls in plotting and TensorFlow hooks, so only the parent imports it
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from churn_prediction_system import ChurnPredictionModel, acquire_data, available_cpus
+    from artifact_cache import ArtifactCache
+
+    n_workers = args.workers or max(1, available_cpus() // args.threads_per_trial)
+    print("=" * 80)
+    print("HYPERPARAMETER SEARCH (successive halving, stratified CV)")
+    print("=" * 80)
+    cache = ArtifactCache(enabled=not args.no_cache)
+    data_key, (df, data_source) = acquire_data(cache)
+    model_trainer = ChurnPredictionModel(df, data_source, cache=cache, data_key=data_key)
+    model_trainer.preprocess_data()
+
+    # Tuned on the training rows only; the test rows stay unseen until evaluate_models
+    results = {}
+    for model_name in args.models:
+        print(f"\n🔍 Tuning {model_name}: {args.trials} trials, {args.folds} folds, eta={args.eta}, "
+              f"{n_workers} workers x {args.threads_per_trial} threads")
+        started = time.perf_counter()
+        results[model_name] = successive_halving(
+            model_name, model_trainer.X_train, model_trainer.y_train, n_trials=args.trials, n_folds=args.folds,
+            eta=args.eta, n_workers=n_workers, threads_per_trial=args.threads_per_trial
+        )
+        print(f"✅ {model_name}: CV ROC-AUC {results[model_name]['cv_roc_auc']:.4f} "
+              f"in {time.perf_counter() - started:.1f}s")
+        print(f"   {results[model_name]['params']}")
+
+    save_best_params(results, args.output, data_source=data_source)
+    print(f"\n💾 Saved best configurations to {args.output}")
+    print("   train_random_forest / train_xgboost use them from the next training run on")
+
+
+if __name__ == "__main__":
+    main()
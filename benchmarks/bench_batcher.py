@@ -0,0 +1,86 @@
+"""
+Benchmark: /predict throughput with and without the micro-batcher
+
+Drives the real predict_churn handler from N concurrent asyncio clients
+(500 by default), first calling the model once per request and then
+through PredictionBatcher at several max batch sizes.
+
+Usage:
+    python benchmarks/bench_batcher.py [--clients 500] [--requests-per-client 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+warnings.filterwarnings('ignore')
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import main
+from main import CustomerData
+from batcher import PredictionBatcher
+
+
+def make_customers(n):
+    return [
+        CustomerData(
+            avg_order_value=20.0 + i % 200, total_purchases=i % 15, email_open_rate=float(i % 100),
+            days_since_last_purchase=float(i % 120), loyalty_program=i % 2, website_visits=i % 40,
+            return_rate=float(i % 30), support_tickets=i % 6, channel=('web', 'mobile', 'app')[i % 3]
+        )
+        for i in range(n)
+    ]
+
+
+async def run_clients(n_clients, requests_per_client, customers):
+    async def client(c):
+        for r in range(requests_per_client):
+            await main.predict_churn(customers[(c * requests_per_client + r) % len(customers)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(n_clients)))
+    return time.perf_counter() - start
+
+
+async def benchmark(args):
+    main.load_artifacts()
+    customers = make_customers(1000)
+    total = args.clients * args.requests_per_client
+
+    print("=" * 80)
+    print(f"/predict THROUGHPUT: {args.clients} concurrent clients x {args.requests_per_client} requests")
+    print("=" * 80)
+    print(f"{'mode':28s} {'req/s':>10s} {'mean batch':>11s} {'batches':>9s}")
+    print("-" * 62)
+
+    main.batcher = None
+    elapsed = await run_clients(args.clients, args.requests_per_client, customers)
+    baseline = total / elapsed
+    print(f"{'one model call per request':28s} {baseline:10.0f} {1.0:11.1f} {total:9d}")
+
+    for max_batch_size in args.batch_sizes:
+        main.batcher = PredictionBatcher(main.predict_customers_async, max_batch_size=max_batch_size,
+                                         max_wait_ms=args.max_wait_ms)
+        main.batcher.start()
+        elapsed = await run_clients(args.clients, args.requests_per_client, customers)
+        stats = main.batcher.stats()
+        await main.batcher.stop()
+        label = f"batcher max_batch={max_batch_size}"
+        print(f"{label:28s} {total / elapsed:10.0f} {stats['batch_size']['mean']:11.1f} {stats['batches']:9d}"
+              f"   ({total / elapsed / baseline:.1f}x)")
+    main.batcher = None
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests-per-client', type=int, default=20)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 64, 256])
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,106 @@
+"""
+Benchmark: whole-frame vs streamed XGBoost training memory
+
+Writes --rows synthetic customers as Parquet shards, then trains the
+200-tree XGBoost three ways, each in a fresh interpreter:
+
+- in-memory: read every shard into one DataFrame, scale it and fit
+  XGBClassifier (what ChurnPredictionModel does)
+- quantile:  external_training with the quantized matrix held in RAM
+- extmem:    external_training with the quantized pages spilled to disk
+
+All three use the same position-hashed test split and the fixed XGB_PARAMS
+(not best_params.json), and report training time, how far training pushed
+peak RSS and test ROC-AUC.
+
+Usage:
+    python benchmarks/bench_external_training.py [--rows 1000000 4000000] [--chunk-rows 250000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from synthetic_data import PROFILES, write_shards
+
+CHILD = """
+import json, resource, sys, time, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, sys.argv[1])
+mode, shard_dir, chunk_rows, n_rounds = sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5])
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+from external_training import (DEFAULT_VALIDATION_SIZE, XGB_PARAMS, expand_paths, infer_feature_names,
+                               test_mask, train_xgboost_external, xgb_classifier)
+from train_and_save_model import customer_matrix
+paths = expand_paths([shard_dir])
+feature_names = infer_feature_names(paths[0])
+peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+if mode == 'in-memory':
+    frames = [pd.read_parquet(path) for path in paths]
+    positions = np.concatenate([np.arange(len(df), dtype=np.uint64) + np.uint64(i << 40)
+                                for i, df in enumerate(frames)])
+    X, y = customer_matrix(pd.concat(frames, ignore_index=True), feature_names)
+    del frames
+    test = test_mask(positions, 0.2)
+    # Same training rows as the streamed run, which also keeps a validation share out
+    train = ~test_mask(positions, 0.2 + DEFAULT_VALIDATION_SIZE)
+    scaler = StandardScaler().fit(X[train])
+    model = xgb_classifier(XGB_PARAMS, n_rounds)
+    model.fit(scaler.transform(X[train]), y[train])
+    auc = roc_auc_score(y[test], model.predict_proba(scaler.transform(X[test]))[:, 1])
+else:
+    result = train_xgboost_external(paths, feature_names, chunk_rows=chunk_rows, params=XGB_PARAMS,
+                                    n_rounds=n_rounds, external_memory=mode == 'extmem')
+    auc = result['metrics']['roc_auc']
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'peak_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before) / 1024,
+    'auc': auc
+}))
+"""
+
+
+def run(mode, shard_dir, chunk_rows, n_rounds):
+    out = subprocess.run([sys.executable, '-c', CHILD, os.path.join(ROOT, 'backend'), mode, shard_dir,
+                          str(chunk_rows), str(n_rounds)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[1_000_000, 4_000_000])
+    parser.add_argument('--chunk-rows', type=int, default=250_000)
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--profile', choices=PROFILES, default='haryana')
+    parser.add_argument('--modes', nargs='*', default=['in-memory', 'quantile', 'extmem'])
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"XGBOOST TRAINING MEMORY: {args.rounds} rounds, chunks of {args.chunk_rows:,} rows ({args.profile})")
+    print("=" * 80)
+    print(f"{'rows':>10s} {'mode':10s} {'seconds':>9s} {'peak +MB':>10s} {'ROC-AUC':>9s}")
+    print("-" * 52)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            shard_dir = os.path.join(tmp, f'shards_{n_rows}')
+            write_shards(shard_dir, n_rows, min(n_rows, 1_000_000), profile=args.profile, compact=True)
+            for mode in args.modes:
+                r = run(mode, shard_dir, args.chunk_rows, args.rounds)
+                print(f"{n_rows:10,d} {mode:10s} {r['seconds']:9.2f} {r['peak_mb']:10.0f} {r['auc']:9.4f}")
+
+    print("\nPeak +MB is the rise in the training process's maximum RSS over its imports.")
+
+
+if __name__ == "__main__":
+    main()
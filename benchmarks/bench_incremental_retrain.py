@@ -0,0 +1,102 @@
+"""
+Benchmark: incremental retraining vs training from scratch
+
+Simulates daily refreshes on synthetic customers: an initial model is
+trained on --base-rows, then each of --days batches of --batch-rows new
+customers arrives. Every day the model is either retrained from scratch
+on everything seen so far (scaler refit + 200 trees, as
+ChurnPredictionModel.train_xgboost does) or updated incrementally from
+the previous day's model (scaler partial_fit + --new-trees more rounds on
+the batch). Reports each day's training time and ROC-AUC on a fixed
+held-out set of later customers.
+
+Usage:
+    python benchmarks/bench_incremental_retrain.py [--base-rows 200000] [--batch-rows 50000] [--days 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+import numpy as np
+import xgboost as xgb
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+warnings.filterwarnings('ignore')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from synthetic_data import PROFILES, generate_range
+from train_and_save_model import customer_matrix, incremental_update
+
+
+def full_train(X, y):
+    """Scaler + XGBoost from scratch, with ChurnPredictionModel.train_xgboost's parameters"""
+    scaler = StandardScaler().fit(X)
+    model = xgb.XGBClassifier(
+        n_estimators=200, max_depth=6, learning_rate=0.05, subsample=0.8, colsample_bytree=0.8,
+        random_state=42, eval_metric='logloss', tree_method='hist'
+    )
+    model.fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-rows', type=int, default=200_000)
+    parser.add_argument('--batch-rows', type=int, default=50_000)
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--holdout-rows', type=int, default=50_000)
+    parser.add_argument('--new-trees', type=int, default=50)
+    parser.add_argument('--profile', choices=PROFILES, default='enhanced')
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, 'backend', 'feature_names.json')) as f:
+        feature_names = json.load(f)
+
+    def rows(start, stop):
+        return customer_matrix(generate_range(start, stop, profile=args.profile), feature_names)
+
+    total_rows = args.base_rows + args.days * args.batch_rows
+    X_holdout, y_holdout = rows(total_rows, total_rows + args.holdout_rows)
+
+    def auc(model, scaler):
+        return roc_auc_score(y_holdout, model.predict_proba(scaler.transform(X_holdout))[:, 1])
+
+    X_seen, y_seen = rows(0, args.base_rows)
+    (model, scaler), seconds = timed(lambda: full_train(X_seen, y_seen))
+    incremental = (model, scaler)
+
+    print("=" * 80)
+    print(f"INCREMENTAL RETRAINING: {args.base_rows:,} initial rows, {args.days} daily batches of "
+          f"{args.batch_rows:,} ({args.profile})")
+    print("=" * 80)
+    print(f"initial model: {seconds:.2f}s, ROC-AUC {auc(model, scaler):.4f}\n")
+    print(f"{'day':>4s} {'rows seen':>11s} {'full s':>8s} {'full AUC':>9s} {'incr s':>8s} {'incr AUC':>9s} "
+          f"{'trees':>6s} {'speedup':>8s}")
+    print("-" * 70)
+    for day in range(1, args.days + 1):
+        start = args.base_rows + (day - 1) * args.batch_rows
+        X_batch, y_batch = rows(start, start + args.batch_rows)
+        X_seen, y_seen = np.vstack([X_seen, X_batch]), np.concatenate([y_seen, y_batch])
+
+        (full_model, full_scaler), full_seconds = timed(lambda: full_train(X_seen, y_seen))
+        incremental, incr_seconds = timed(lambda: incremental_update(*incremental, X_batch, y_batch,
+                                                                     n_new_trees=args.new_trees))
+        trees = incremental[0].get_booster().num_boosted_rounds()
+        print(f"{day:4d} {len(X_seen):11,d} {full_seconds:8.2f} {auc(full_model, full_scaler):9.4f} "
+              f"{incr_seconds:8.2f} {auc(*incremental):9.4f} {trees:6d} {full_seconds / incr_seconds:7.1f}x")
+
+    print("\nIncremental models grow by up to --new-trees per day; retrain from scratch periodically to reset size.")
+
+
+if __name__ == "__main__":
+    main()
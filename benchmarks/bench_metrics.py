@@ -0,0 +1,83 @@
+"""
+Benchmark: evaluation metrics on large test sets
+
+Times the sklearn calls evaluate_models used to make for each model
+(accuracy, precision, recall, F1, ROC-AUC, confusion matrix, then
+roc_curve again for the plot) against ScoreCurve, which sorts the scores
+once and reads everything off cumulative counts, and checks that both
+report the same numbers.
+
+Usage:
+    python benchmarks/bench_metrics.py [--rows 1000000 5000000]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from sklearn.metrics import (accuracy_score, precision_score, recall_score,
+                             f1_score, roc_auc_score, confusion_matrix, roc_curve,
+                             average_precision_score)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from metrics_engine import ScoreCurve
+
+
+def sklearn_metrics(y_true, y_score):
+    """evaluate_models + plot_roc_curves before the single-pass engine"""
+    y_pred = (y_score > 0.5).astype(int)
+    results = {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'precision': precision_score(y_true, y_pred),
+        'recall': recall_score(y_true, y_pred),
+        'f1_score': f1_score(y_true, y_pred),
+        'roc_auc': roc_auc_score(y_true, y_score),
+        'confusion_matrix': confusion_matrix(y_true, y_pred)
+    }
+    roc_curve(y_true, y_score)
+    return results
+
+
+def engine_metrics(y_true, y_score):
+    """The same results from one ScoreCurve"""
+    curve = ScoreCurve(y_true, y_score)
+    results = curve.metrics_at(0.5)
+    results['roc_auc'] = curve.roc_auc()
+    results['average_precision'] = curve.average_precision()
+    curve.roc_curve(drop_intermediate=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("EVALUATION METRICS: sklearn calls vs single-pass ScoreCurve")
+    print("=" * 80)
+    print(f"{'rows':>11s} {'sklearn s':>10s} {'engine s':>9s} {'speedup':>8s} {'max |diff|':>11s}")
+    print("-" * 54)
+    for n_rows in args.rows:
+        rng = np.random.default_rng(0)
+        y_true = rng.integers(0, 2, n_rows)
+        # Rounded like predict_proba output from tree ensembles, so ties occur
+        y_score = np.round(1 / (1 + np.exp(-(y_true - 0.5 + rng.normal(size=n_rows)))), 4).astype(np.float32)
+
+        started = time.perf_counter()
+        expected = sklearn_metrics(y_true, y_score)
+        sklearn_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        got = engine_metrics(y_true, y_score)
+        engine_seconds = time.perf_counter() - started
+
+        expected['average_precision'] = average_precision_score(y_true, y_score)
+        diff = max(abs(float(np.max(np.abs(np.asarray(expected[k]) - np.asarray(got[k]))))) for k in expected)
+        print(f"{n_rows:11,d} {sklearn_seconds:10.2f} {engine_seconds:9.2f} "
+              f"{sklearn_seconds / engine_seconds:7.1f}x {diff:11.2e}")
+
+
+if __name__ == "__main__":
+    main()
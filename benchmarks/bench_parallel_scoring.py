@@ -0,0 +1,81 @@
+"""
+Benchmark: bulk-scoring throughput vs number of worker processes
+
+Builds an N-row customer CSV (customer_data.csv repeated) and scores it
+with the streaming single-process path and then with the process pool at
+1, 2, 4, ... workers up to the core count. Reports rows/s, the speedup
+over one worker and the parallel efficiency (speedup / workers).
+
+Usage:
+    python benchmarks/bench_parallel_scoring.py [--rows 2000000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from cli import BulkScorer, score_file, score_file_parallel
+
+
+def make_input(path, n_rows):
+    base = pd.read_csv(os.path.join(ROOT, 'customer_data.csv'))
+    reps = -(-n_rows // len(base))
+    df = pd.concat([base] * reps, ignore_index=True).iloc[:n_rows]
+    df['customer_id'] = [f"C{i:09d}" for i in range(len(df))]
+    df.to_csv(path, index=False)
+
+
+def default_worker_counts():
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='*', default=None,
+                        help="worker counts to try (default: powers of two up to the core count)")
+    parser.add_argument('--partition-mb', type=float, default=16)
+    args = parser.parse_args()
+    worker_counts = args.workers or default_worker_counts()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'customers.csv')
+        output_path = os.path.join(tmp, 'scores.csv')
+        make_input(input_path, args.rows)
+
+        print("=" * 80)
+        print(f"PARALLEL BULK SCORING: {args.rows:,} rows "
+              f"({os.path.getsize(input_path) / 1e6:.0f} MB CSV), {os.cpu_count()} cores")
+        print("=" * 80)
+        print(f"{'mode':22s} {'seconds':>9s} {'rows/s':>12s} {'speedup':>9s} {'efficiency':>11s}")
+        print("-" * 67)
+
+        summary = score_file(input_path, output_path, BulkScorer(), progress_interval=0)
+        print(f"{'streaming (1 process)':22s} {summary['seconds']:9.2f} {summary['rows_per_second']:12,.0f}")
+
+        baseline = None
+        for workers in worker_counts:
+            summary = score_file_parallel(input_path, output_path, workers=workers,
+                                          partition_bytes=args.partition_mb * 1024 * 1024,
+                                          progress_interval=0)
+            rate = summary['rows_per_second']
+            baseline = baseline or rate
+            speedup = rate / baseline
+            print(f"{f'{workers} workers':22s} {summary['seconds']:9.2f} {rate:12,.0f} "
+                  f"{speedup:8.2f}x {speedup / workers:10.0%}")
+
+    print("\nWorker times include process spawn and model load (once per worker).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark: per-request latency of the /predict feature path
+
+Compares the original DataFrame + LabelEncoder + StandardScaler.transform
+path (model.pkl + scaler.pkl) with the precompiled FeaturePlan and the
+artifacts the server loads, both for feature preparation alone and
+end-to-end including model.predict_proba.
+
+Usage:
+    python benchmarks/bench_predict_latency.py [--iterations 5000]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+warnings.filterwarnings('ignore')
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import main
+from main import CustomerData
+
+
+legacy_model = None
+legacy_scaler = None
+
+
+def legacy_features(customer):
+    """The pre-FeaturePlan /predict feature path"""
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.array(['app', 'mobile', 'web'])
+    channel_encoded = label_encoder.transform([customer.channel])[0]
+    feature_dict = {name: getattr(customer, name) for name in main.feature_names if name != 'channel_encoded'}
+    feature_dict['channel_encoded'] = channel_encoded
+    customer_df = pd.DataFrame([feature_dict])
+    return legacy_scaler.transform(customer_df[main.feature_names])
+
+
+def legacy_predict(customer):
+    return legacy_model.predict_proba(legacy_features(customer))[:, 1]
+
+
+def plan_features(customer):
+    return main.feature_plan.transform_row(customer)
+
+
+def measure(fn, customer, iterations):
+    """Return per-call latencies in microseconds"""
+    for _ in range(min(200, iterations)):
+        fn(customer)
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(customer)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def report(label, timings):
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"{label:32s} p50: {p50:9.1f} us   p99: {p99:9.1f} us")
+    return p50, p99
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    global legacy_model, legacy_scaler
+    main.load_artifacts()
+    legacy_model = joblib.load(main.MODEL_PATH)
+    legacy_scaler = joblib.load(main.SCALER_PATH)
+    customer = CustomerData(
+        avg_order_value=50.0, total_purchases=5, email_open_rate=50.0,
+        days_since_last_purchase=30, loyalty_program=0, website_visits=15,
+        return_rate=10.0, support_tickets=1, channel='web'
+    )
+
+    np.testing.assert_allclose(main.predict_proba_scaled(plan_features(customer)), legacy_predict(customer), rtol=1e-6)
+
+    print("=" * 80)
+    print(f"/predict LATENCY ({args.iterations} iterations)")
+    print("=" * 80)
+
+    print("\nFeature preparation:")
+    before = report("  before (DataFrame + sklearn)", measure(legacy_features, customer, args.iterations))
+    after = report("  after  (FeaturePlan)", measure(plan_features, customer, args.iterations))
+    print(f"  speedup p50: {before[0] / after[0]:.1f}x   p99: {before[1] / after[1]:.1f}x")
+
+    print("\nEnd-to-end (features + predict_proba):")
+    before = report("  before", measure(legacy_predict, customer, args.iterations))
+    after = report("  after", measure(lambda c: main.predict_proba_scaled(plan_features(c)), customer, args.iterations))
+    print(f"  speedup p50: {before[0] / after[0]:.1f}x   p99: {before[1] / after[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,82 @@
+"""
+Benchmark: /predict latency on prediction-cache hits vs misses
+
+Calls the real predict_churn handler (without the micro-batcher) for
+distinct customers (every call a miss, including the cache write) and
+then for the same customers again (every call a hit), and reports
+p50/p99 per call.
+
+Usage:
+    python benchmarks/bench_prediction_cache.py [--customers 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+import numpy as np
+
+warnings.filterwarnings('ignore')
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import main
+from main import CustomerData
+from prediction_cache import PredictionCache
+
+
+def make_customers(n):
+    return [
+        CustomerData(
+            avg_order_value=20.0 + i * 0.01, total_purchases=i % 15, email_open_rate=float(i % 100),
+            days_since_last_purchase=float(i % 120), loyalty_program=i % 2, website_visits=i % 40,
+            return_rate=float(i % 30), support_tickets=i % 6, channel=('web', 'mobile', 'app')[i % 3],
+            customer_age=18.0 + i % 60
+        )
+        for i in range(n)
+    ]
+
+
+async def time_calls(customers):
+    timings = np.empty(len(customers))
+    for i, customer in enumerate(customers):
+        t0 = time.perf_counter()
+        await main.predict_churn(customer)
+        timings[i] = time.perf_counter() - t0
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:28s} p50: {np.percentile(timings, 50) * 1e6:8.1f} us   "
+          f"p99: {np.percentile(timings, 99) * 1e6:8.1f} us")
+    return np.percentile(timings, 50)
+
+
+async def benchmark(args):
+    main.load_artifacts()
+    main.batcher = None
+    customers = make_customers(args.customers)
+
+    print("=" * 80)
+    print(f"/predict PREDICTION CACHE: {args.customers} customers")
+    print("=" * 80)
+    main.prediction_cache = None
+    uncached = report("no cache", await time_calls(customers))
+
+    main.prediction_cache = PredictionCache(max_bytes=args.max_mb * 1024 * 1024)
+    miss = report("cache miss (+ store)", await time_calls(customers))
+    hit = report("cache hit", await time_calls(customers))
+    stats = main.prediction_cache.stats()
+    print(f"\nhit speedup vs no cache: {uncached / hit:.1f}x   miss overhead: {(miss - uncached) * 1e6:+.1f} us")
+    print(f"entries: {stats['entries']}  bytes: {stats['bytes']:,}  evictions: {stats['evictions']}")
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--max-mb', type=float, default=64.0)
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_benchmark()
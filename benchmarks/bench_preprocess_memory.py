@@ -0,0 +1,105 @@
+"""
+Benchmark: ChurnPredictionModel.preprocess_data memory and time
+
+Each mode runs in a fresh interpreter on --rows synthetic customers
+(enhanced profile, compact dtypes) and reports how far preprocessing plus
+handing the arrays to a short XGBoost fit pushed peak RSS:
+
+- before: df.copy(), train_test_split on DataFrames, fit_transform to
+  float64, new DataFrames and .values per model (reproduced below)
+- after:  ChurnPredictionModel.preprocess_data, one float32 matrix with
+  train/test views scaled in place
+
+Usage:
+    python benchmarks/bench_preprocess_memory.py [--rows 1000000 10000000] [--rounds 10]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, sys, time, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, sys.argv[1])
+sys.path.insert(0, sys.argv[1] + '/backend')
+mode, n_rows, n_rounds = sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from churn_prediction_system import ChurnPredictionModel
+from synthetic_data import generate_range
+
+
+def before(df):
+    df_processed = df.copy()
+    df_processed['channel_encoded'] = LabelEncoder().fit_transform(df_processed['channel'])
+    feature_cols = [col for col in df_processed.columns
+                    if col not in ['customer_id', 'churned', 'channel', 'channel_encoded']] + ['channel_encoded']
+    X, y = df_processed[feature_cols], df_processed['churned']
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    scaler = StandardScaler()
+    X_train = pd.DataFrame(scaler.fit_transform(X_train), columns=feature_cols)
+    X_test = pd.DataFrame(scaler.transform(X_test), columns=feature_cols)
+    return X_train.values, X_test.values, y_train.reset_index(drop=True).values
+
+
+df = generate_range(0, n_rows, profile='enhanced', compact=True)
+peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+if mode == 'before':
+    X_train, X_test, y_train = before(df)
+else:
+    trainer = ChurnPredictionModel(df)
+    trainer.preprocess_data()
+    X_train, X_test, y_train = trainer.X_train, trainer.X_test, trainer.y_train
+preprocess_seconds = time.perf_counter() - started
+preprocess_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+model = xgb.XGBClassifier(n_estimators=n_rounds, max_depth=6, learning_rate=0.05, tree_method='hist')
+model.fit(X_train, y_train)
+model.predict_proba(X_test)
+print(json.dumps({
+    'preprocess_seconds': preprocess_seconds,
+    'total_seconds': time.perf_counter() - started,
+    'preprocess_peak_mb': (preprocess_peak - peak_before) / 1024,
+    'peak_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before) / 1024,
+    'frame_mb': df.memory_usage(deep=True).sum() / 2**20
+}))
+"""
+
+
+def run(mode, n_rows, n_rounds):
+    out = subprocess.run([sys.executable, '-c', CHILD, ROOT, mode, str(n_rows), str(n_rounds)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[1_000_000, 10_000_000])
+    parser.add_argument('--rounds', type=int, default=10, help="XGBoost rounds fitted on the arrays")
+    parser.add_argument('--modes', nargs='*', default=['before', 'after'])
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"PREPROCESSING MEMORY: preprocess_data + {args.rounds}-round XGBoost fit")
+    print("=" * 80)
+    print(f"{'rows':>11s} {'mode':7s} {'frame MB':>9s} {'prep s':>8s} {'prep +MB':>9s} "
+          f"{'total s':>8s} {'peak +MB':>9s}")
+    print("-" * 67)
+    for n_rows in args.rows:
+        for mode in args.modes:
+            r = run(mode, n_rows, args.rounds)
+            print(f"{n_rows:11,d} {mode:7s} {r['frame_mb']:9.0f} {r['preprocess_seconds']:8.2f} "
+                  f"{r['preprocess_peak_mb']:9.0f} {r['total_seconds']:8.2f} {r['peak_mb']:9.0f}")
+
+    print("\n+MB is the rise in the process's maximum RSS over the generated DataFrame.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: retention rules per customer vs one vectorized pass
+
+Scores the served Haryana rule table over N synthetic customers, first
+one record at a time (the /predict path) and then as NumPy masks over
+the whole batch, and checks both give the same actions.
+
+Usage:
+    python benchmarks/bench_retention_rules.py [--rows 1000000] [--loop-rows 50000]
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from retention_rules import load_rules, HARYANA_RULES_PATH
+
+
+def make_customers(n, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'avg_order_value': rng.gamma(2.0, 40.0, n),
+        'total_purchases': rng.integers(0, 20, n),
+        'email_open_rate': rng.uniform(0, 100, n),
+        'days_since_last_purchase': rng.exponential(40.0, n),
+        'loyalty_program': rng.integers(0, 2, n),
+        'return_rate': rng.uniform(0, 30, n),
+        'support_tickets': rng.poisson(1.5, n),
+        'channel': rng.choice(['web', 'mobile', 'app'], n),
+        'mobile_usage_pct': rng.uniform(0, 100, n)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--loop-rows', type=int, default=50_000, help="rows scored one at a time")
+    parser.add_argument('--rules', default=HARYANA_RULES_PATH)
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules)
+    df = make_customers(args.rows)
+    churn_probs = np.random.default_rng(0).random(args.rows)
+
+    print("=" * 80)
+    print(f"RETENTION RULES: {len(rules)} rules, {args.rows:,} customers")
+    print("=" * 80)
+
+    records = [SimpleNamespace(**row) for row in df.iloc[:args.loop_rows].to_dict('records')]
+    start = time.perf_counter()
+    looped = [rules.recommend_one(record, p) for record, p in zip(records, churn_probs)]
+    per_row = (time.perf_counter() - start) / len(records)
+    print(f"{'one customer at a time':26s} {per_row * 1e6:8.2f} us/row   "
+          f"(~{per_row * args.rows:.1f} s for {args.rows:,})")
+
+    start = time.perf_counter()
+    vectorized = rules.recommend(df, churn_probability=churn_probs)
+    elapsed = time.perf_counter() - start
+    print(f"{'vectorized masks':26s} {elapsed / args.rows * 1e6:8.2f} us/row   "
+          f"({elapsed:.2f} s for {args.rows:,}, {per_row * args.rows / elapsed:.0f}x)")
+
+    status = "✅" if looped == vectorized[:len(looped)] else "❌"
+    print(f"\n{status} per-row and vectorized actions agree on {len(looped):,} rows")
+
+
+if __name__ == "__main__":
+    main()
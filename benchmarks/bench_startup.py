@@ -0,0 +1,65 @@
+"""
+Benchmark: cold-start time of the API for each artifact format
+
+Each run is a fresh interpreter that imports backend/main.py and calls
+load_artifacts(), forced onto the model bundle, model_unscaled.json or
+the model.pkl + scaler.pkl pickles. Reports wall time to ready, the
+artifact-load share and which heavy libraries got imported.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeats 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+CHILD = """
+import json, sys, time, warnings
+warnings.filterwarnings('ignore')
+t0 = time.perf_counter()
+import main
+source = sys.argv[1]
+if source != 'bundle':
+    main.MODEL_BUNDLE_PATH = '/nonexistent'
+if source == 'pickle':
+    main.UNSCALED_MODEL_PATH = '/nonexistent'
+main.load_artifacts()
+print(json.dumps({
+    'total': time.perf_counter() - t0,
+    'artifacts': main.startup_timings['artifact_load_seconds'],
+    'imported': [m for m in ('pandas', 'sklearn', 'xgboost', 'joblib') if m in sys.modules]
+}))
+"""
+
+
+def run_once(source):
+    out = subprocess.run([sys.executable, '-c', CHILD, source], cwd=BACKEND_DIR,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"COLD START: import main + load_artifacts (median of {args.repeats})")
+    print("=" * 80)
+    print(f"{'source':8s} {'ready':>10s} {'artifacts':>12s}   heavy imports")
+    print("-" * 62)
+    for source in ('bundle', 'json', 'pickle'):
+        runs = [run_once(source) for _ in range(args.repeats)]
+        total = np.median([r['total'] for r in runs])
+        artifacts = np.median([r['artifacts'] for r in runs])
+        imported = ", ".join(runs[-1]['imported']) or "-"
+        print(f"{source:8s} {total * 1e3:8.0f}ms {artifacts * 1e3:10.1f}ms   {imported}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: synthetic customer generation throughput and memory
+
+Times the previous whole-frame generator (global np.random, reproduced
+below) against the block-seeded generator with full and compact dtypes,
+reporting rows/s, frame size and peak traced allocation. Then streams the
+dataset to Parquet shards with 1, 2, 4, ... worker processes and checks
+that every worker count writes the same rows.
+
+Usage:
+    python benchmarks/bench_synthetic_data.py [--rows 5000000] [--profile haryana] [--workers 1 2 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+from synthetic_data import PROFILES, generate_range, write_shards
+
+
+def legacy_haryana(n):
+    """train_model.generate_haryana_business_data before the block generator"""
+    np.random.seed(42)
+    df = pd.DataFrame({
+        "customer_age": np.random.randint(20, 60, n),
+        "account_age_days": np.random.randint(30, 1000, n),
+        "total_purchases": np.random.randint(1, 20, n),
+        "avg_order_value": np.random.randint(50, 5000, n),
+        "days_since_last_purchase": np.random.randint(1, 200, n),
+        "website_visits": np.random.randint(0, 40, n),
+        "email_open_rate": np.random.uniform(0, 100, n),
+        "support_tickets": np.random.poisson(1.2, n),
+        "product_categories_browsed": np.random.randint(1, 12, n),
+        "avg_session_duration_min": np.random.uniform(1, 25, n),
+        "loyalty_program": np.random.randint(0, 2, n),
+        "discount_usage": np.random.randint(0, 6, n),
+        "review_count": np.random.randint(0, 10, n),
+        "payment_failures": np.random.randint(0, 3, n),
+        "return_rate": np.random.uniform(0, 40, n),
+        "mobile_usage_pct": np.random.uniform(20, 95, n),
+        "channel": np.random.choice(["web", "mobile", "app"], n)
+    })
+    score = (
+        0.28 * (df["days_since_last_purchase"] / 200) +
+        0.20 * (df["support_tickets"] / 8) +
+        0.18 * (df["return_rate"] / 40) +
+        0.14 * (1 - df["email_open_rate"] / 100) +
+        0.12 * (df["total_purchases"] < 3).astype(int) +
+        0.10 * (1 - df["loyalty_program"]) +
+        0.08 * (df["payment_failures"] / 3)
+    )
+    df["churn_prob"] = score
+    df["churned"] = (df["churn_prob"] > 0.45).astype(int)
+    return df
+
+
+def measure(fn):
+    """Seconds, frame MB and peak traced MB; timed untraced since tracing slows string columns"""
+    started = time.perf_counter()
+    df = fn()
+    seconds = time.perf_counter() - started
+    frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    del df
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, frame_mb, peak / 1e6
+
+
+def default_worker_counts():
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--profile', choices=PROFILES, default='haryana')
+    parser.add_argument('--shard-rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='*', default=None,
+                        help="worker counts to try (default: powers of two up to the core count)")
+    args = parser.parse_args()
+    n_rows = args.rows
+
+    print("=" * 80)
+    print(f"SYNTHETIC DATA: {n_rows:,} {args.profile} rows in memory")
+    print("=" * 80)
+    print(f"{'generator':28s} {'seconds':>9s} {'rows/s':>12s} {'frame MB':>10s} {'peak MB':>10s}")
+    print("-" * 73)
+    modes = [('block-seeded', lambda: generate_range(0, n_rows, profile=args.profile)),
+             ('block-seeded, compact', lambda: generate_range(0, n_rows, profile=args.profile, compact=True))]
+    if args.profile == 'haryana':
+        modes.insert(0, ('global np.random (before)', lambda: legacy_haryana(n_rows)))
+    for name, fn in modes:
+        seconds, frame_mb, peak_mb = measure(fn)
+        print(f"{name:28s} {seconds:9.2f} {n_rows / seconds:12,.0f} {frame_mb:10.0f} {peak_mb:10.0f}")
+
+    print("\n" + "=" * 80)
+    print(f"STREAMED TO PARQUET SHARDS of {args.shard_rows:,} rows")
+    print("=" * 80)
+    print(f"{'workers':>8s} {'seconds':>9s} {'rows/s':>12s} {'MB on disk':>11s}   same rows")
+    print("-" * 58)
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers or default_worker_counts():
+            out_dir = os.path.join(tmp, f"w{workers}")
+            started = time.perf_counter()
+            shards = write_shards(out_dir, n_rows, args.shard_rows, workers=workers,
+                                  profile=args.profile, compact=True)
+            seconds = time.perf_counter() - started
+            size_mb = sum(os.path.getsize(path) for path, _ in shards) / 1e6
+            digest = [pd.util.hash_pandas_object(pd.read_parquet(path), index=False).sum() for path, _ in shards]
+            reference = reference or digest
+            print(f"{workers:8d} {seconds:9.2f} {n_rows / seconds:12,.0f} {size_mb:11.0f}   "
+                  f"{'✅' if digest == reference else '❌'}")
+
+    print("\nWorker times include process spawn.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: loading the IBM Telco CSV, inferred vs typed vs cached
+
+Each mode runs in a fresh interpreter and reports load time, the size of
+the loaded frame and how far the load pushed peak RSS:
+
+- inferred: the old pd.read_csv with every column and inferred dtypes
+- typed:    RealDataLoader.load_ibm_csv parsing the CSV (cache miss)
+- cached:   RealDataLoader.load_ibm_csv reading its Parquet cache
+
+Usage:
+    python benchmarks/bench_telco_load.py [--rows 7043 1000000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, sys, time, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, sys.argv[1])
+import pandas as pd
+from churn_prediction_system import RealDataLoader
+mode, path, cache_dir = sys.argv[2:5]
+peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+if mode == 'inferred':
+    df = pd.read_csv(path)
+else:
+    df = RealDataLoader().load_ibm_csv(path, cache_dir=cache_dir)
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'frame_mb': df.memory_usage(deep=True).sum() / 2**20,
+    'peak_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before) / 1024
+}))
+"""
+
+
+def run(mode, path, cache_dir):
+    out = subprocess.run([sys.executable, '-c', CHILD, ROOT, mode, path, cache_dir],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[7043, 1_000_000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(os.path.join(ROOT, 'Telco-Customer-Churn.csv'))
+    print("=" * 80)
+    print("IBM TELCO LOAD: inferred vs typed vs cached")
+    print("=" * 80)
+    print(f"{'rows':>10s} {'mode':10s} {'seconds':>9s} {'frame MB':>10s} {'peak +MB':>10s}")
+    print("-" * 53)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = os.path.join(tmp, f'telco_{n_rows}.csv')
+            reps = -(-n_rows // len(base))
+            pd.concat([base] * reps, ignore_index=True).iloc[:n_rows].to_csv(path, index=False)
+            cache_dir = os.path.join(tmp, f'cache_{n_rows}')
+            for mode in ('inferred', 'typed', 'cached'):
+                r = run(mode, path, cache_dir)
+                print(f"{n_rows:10,d} {mode:10s} {r['seconds']:9.3f} {r['frame_mb']:10.1f} {r['peak_mb']:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
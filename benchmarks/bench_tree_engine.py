@@ -0,0 +1,87 @@
+"""
+Benchmark: CompiledForest backends vs XGBClassifier.predict_proba
+
+Loads the served model (model_unscaled.json, exported by
+train_and_save_model.py), checks every backend against xgboost to 1e-6 and
+times batch sizes 1, 64, 4096 and 1M.
+
+Usage:
+    python benchmarks/bench_tree_engine.py [--sizes 1 64 4096 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import xgboost as xgb
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.append(BACKEND_DIR)
+
+from tree_engine import CompiledForest, BACKENDS, numba
+
+MODEL_PATH = os.path.join(BACKEND_DIR, 'model_unscaled.json')
+
+
+def time_call(fn, X, min_seconds=0.5, max_repeats=1000):
+    """Median seconds per call, repeating small batches until min_seconds"""
+    fn(X)
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < max_repeats and (time.perf_counter() - start < min_seconds or len(timings) < 3):
+        t0 = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 64, 4096, 1_000_000])
+    parser.add_argument('--model', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    model = xgb.XGBClassifier()
+    model.load_model(args.model)
+    forest = CompiledForest.from_file(args.model)
+    backends = [b for b in BACKENDS if b != 'numba' or numba is not None]
+
+    # Synthetic rows spread over every split, with a few missing values
+    rng = np.random.default_rng(42)
+    thresholds = [forest.threshold[(forest.feature == f) & ~np.isnan(forest.threshold)]
+                  for f in range(forest.n_features)]
+    lo = np.array([t.min() if len(t) else 0.0 for t in thresholds])
+    hi = np.array([t.max() if len(t) else 1.0 for t in thresholds])
+    X_all = (lo + (hi - lo) * rng.uniform(-0.1, 1.1, (max(args.sizes), forest.n_features))).astype(np.float32)
+    X_all[rng.random(X_all.shape) < 0.001] = np.nan
+
+    print("=" * 80)
+    print(f"TREE ENGINE BENCHMARK ({forest.n_trees} trees, depth {forest.max_depth}, {forest.n_features} features)")
+    print("=" * 80)
+
+    X_check = X_all[:100_000]
+    expected = model.predict_proba(X_check)[:, 1]
+    for backend in backends:
+        forest.set_backend(backend)
+        max_diff = np.abs(forest.predict(X_check) - expected).max()
+        status = "✅" if max_diff <= 1e-6 else "❌"
+        print(f"{status} {backend:8s} max |p - predict_proba| = {max_diff:.2e}")
+
+    header = f"\n{'batch':>9s} {'predict_proba':>15s}" + "".join(f" {b:>15s}" for b in backends)
+    print(header)
+    print("-" * (len(header) - 1))
+    for size in args.sizes:
+        X = X_all[:size]
+        row = [time_call(lambda a: model.predict_proba(a), X)]
+        for backend in backends:
+            forest.set_backend(backend)
+            row.append(time_call(forest.predict, X))
+        cells = "".join(f" {t * 1e3:12.3f} ms" for t in row)
+        print(f"{size:9d}{cells}")
+        best = min(row[1:])
+        print(f"{'':9s} {'':>15s} best speedup {row[0] / best:.1f}x, "
+              f"{size / best:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
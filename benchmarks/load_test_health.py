@@ -0,0 +1,132 @@
+"""
+Load test: /health latency while /predict is saturated
+
+Starts the API under uvicorn once per INFERENCE_POOL setting, measures
+/health latency idle, then again while N concurrent clients hammer
+/predict (or /predict/batch with --batch-size > 1), and reports p50/p99.
+With inference on a worker pool the loaded /health latency should stay
+close to the idle one.
+
+Usage:
+    python benchmarks/load_test_health.py [--pools none thread process] [--clients 64]
+                                          [--batch-size 1] [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+CUSTOMER = {
+    "avg_order_value": 85.0, "total_purchases": 4, "email_open_rate": 25.0,
+    "days_since_last_purchase": 75.0, "loyalty_program": 0, "website_visits": 12,
+    "return_rate": 18.0, "support_tickets": 4, "channel": "mobile"
+}
+
+
+async def wait_until_ready(client, timeout=120.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("Server did not become ready")
+
+
+async def probe_health(client, duration, interval=0.02):
+    """Hit /health every `interval` seconds for `duration`, return latencies (ms)"""
+    latencies = []
+    stop = time.perf_counter() + duration
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - t0) * 1e3)
+        await asyncio.sleep(interval)
+    return np.array(latencies)
+
+
+async def saturate(client, path, body, stop_event):
+    """Post `body` to `path` back to back until stopped, return request count"""
+    n = 0
+    headers = {"content-type": "application/json"}
+    while not stop_event.is_set():
+        r = await client.post(path, content=body, headers=headers)
+        r.raise_for_status()
+        n += 1
+    return n
+
+
+async def run_scenario(port, args):
+    if args.batch_size > 1:
+        path, body = "/predict/batch", json.dumps([CUSTOMER] * args.batch_size)
+    else:
+        path, body = "/predict", json.dumps(CUSTOMER)
+
+    limits = httpx.Limits(max_connections=args.clients + 8)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60.0, limits=limits) as client, \
+            httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60.0) as probe:
+        await wait_until_ready(probe)
+        idle = await probe_health(probe, args.idle_duration)
+
+        stop_event = asyncio.Event()
+        workers = [asyncio.create_task(saturate(client, path, body, stop_event)) for _ in range(args.clients)]
+        await asyncio.sleep(0.5)  # let the load ramp up
+        t0 = time.perf_counter()
+        loaded = await probe_health(probe, args.duration)
+        elapsed = time.perf_counter() - t0
+        stop_event.set()
+        n_requests = sum(await asyncio.gather(*workers))
+    return idle, loaded, n_requests * args.batch_size / elapsed
+
+
+def start_server(pool, port, args):
+    env = dict(os.environ, INFERENCE_POOL=pool)
+    if args.workers:
+        env["INFERENCE_WORKERS"] = str(args.workers)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pools', nargs='+', default=['none', 'thread'], choices=['none', 'thread', 'process'])
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=1, help="records per request; >1 uses /predict/batch")
+    parser.add_argument('--workers', type=int, default=None, help="INFERENCE_WORKERS (default: server default)")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--idle-duration', type=float, default=3.0)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    endpoint = f"/predict/batch x{args.batch_size}" if args.batch_size > 1 else "/predict"
+    print(f"/health LATENCY UNDER LOAD: {args.clients} clients saturating {endpoint}, {os.cpu_count()} cores")
+    print("=" * 80)
+    print(f"{'pool':8s} {'idle p50':>10s} {'idle p99':>10s} {'load p50':>10s} {'load p99':>10s} {'rows/s':>10s}")
+    print("-" * 62)
+
+    for pool in args.pools:
+        server = start_server(pool, args.port, args)
+        try:
+            idle, loaded, rows_per_s = asyncio.run(run_scenario(args.port, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        print(f"{pool:8s} {np.percentile(idle, 50):8.2f}ms {np.percentile(idle, 99):8.2f}ms "
+              f"{np.percentile(loaded, 50):8.2f}ms {np.percentile(loaded, 99):8.2f}ms {rows_per_s:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
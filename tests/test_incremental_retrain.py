@@ -0,0 +1,77 @@
+"""
+Incremental retraining on top of a model trained out of core (train_and_save_model.py --from-files)
+"""
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+import pytest
+import xgboost as xgb
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import train_and_save_model
+from model_bundle import ModelBundle
+from synthetic_data import generate_range
+
+SHARD_ROWS = 50_000
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    """Point the saved artifacts at tmp_path and write four generated customer shards there"""
+    for name in ('MODEL_PATH', 'SCALER_PATH', 'UNSCALED_MODEL_PATH', 'FEATURE_NAMES_PATH', 'BUNDLE_PATH'):
+        monkeypatch.setattr(train_and_save_model, name,
+                            str(tmp_path / os.path.basename(getattr(train_and_save_model, name))))
+    shards = tmp_path / 'shards'
+    shards.mkdir()
+    for part in range(4):
+        generate_range(part * SHARD_ROWS, (part + 1) * SHARD_ROWS, profile='haryana').to_parquet(
+            shards / f'part-{part:05d}.parquet', index=False)
+    return tmp_path
+
+
+def served_matches_pipeline(rows):
+    """model_unscaled.json on raw rows against model.pkl on scaler.pkl's output"""
+    model = joblib.load(train_and_save_model.MODEL_PATH)
+    scaler = joblib.load(train_and_save_model.SCALER_PATH)
+    served = xgb.XGBClassifier()
+    served.load_model(train_and_save_model.UNSCALED_MODEL_PATH)
+    rows = rows.astype(np.float32).astype(np.float64)
+    return np.array_equal(served.predict_proba(rows), model.predict_proba(scaler.transform(rows)))
+
+
+def test_incremental_after_out_of_core_training(artifact_dir):
+    shards = artifact_dir / 'shards'
+    train_and_save_model.train_from_files([str(shards)], chunk_rows=30_000)
+
+    for part in (1, 2, 3):
+        train_and_save_model.retrain_incremental(str(shards / f'part-{part:05d}.parquet'))
+        with open(train_and_save_model.FEATURE_NAMES_PATH) as f:
+            feature_names = json.load(f)
+        rows, _ = train_and_save_model.customer_matrix(
+            generate_range(0, 5_000, seed=7, profile='haryana'), feature_names)
+        assert served_matches_pipeline(rows)
+    assert ModelBundle(train_and_save_model.BUNDLE_PATH).metadata['training_round'] == 3
+
+
+def test_failed_export_keeps_previous_artifacts(artifact_dir, monkeypatch):
+    shards = artifact_dir / 'shards'
+    train_and_save_model.train_from_files([str(shards)], chunk_rows=30_000)
+    paths = [
+        train_and_save_model.MODEL_PATH, train_and_save_model.SCALER_PATH,
+        train_and_save_model.UNSCALED_MODEL_PATH, train_and_save_model.FEATURE_NAMES_PATH,
+        train_and_save_model.BUNDLE_PATH
+    ]
+    before = {path: open(path, 'rb').read() for path in paths}
+
+    def deviates(*args, **kwargs):
+        raise ValueError("Folded model deviates from scaler+model pipeline")
+
+    monkeypatch.setattr(train_and_save_model, 'verify_folded_model', deviates)
+    with pytest.raises(ValueError):
+        train_and_save_model.retrain_incremental(str(shards / 'part-00001.parquet'))
+    assert {path: open(path, 'rb').read() for path in paths} == before
+    assert sorted(os.listdir(artifact_dir)) == sorted(['shards'] + [os.path.basename(path) for path in paths])